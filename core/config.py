@@ -127,44 +127,60 @@ def resolve_engine_options(database_uri):
     }
 
 
+def _validate_production_secrets(debug, secret_key, pair_token_pepper,
+                                 rate_limit_storage_uri='', redis_url=''):
+    """校验生产环境的密钥与限流配置（纯函数，不读环境变量）。
+
+    校验不通过时抛出 RuntimeError；debug 为真时直接放行。
+    """
+    if debug:
+        return
+
+    secret_key = (secret_key or '').strip()
+    pair_token_pepper = (pair_token_pepper or '').strip()
+    rate_limit_storage_uri = (rate_limit_storage_uri or '').strip()
+    redis_url = (redis_url or '').strip()
+
+    if not secret_key:
+        raise RuntimeError(
+            "SECRET_KEY 未设置！生产环境必须配置。\n"
+            "  生成方式: python3 -c 'import secrets; print(secrets.token_hex(32))'"
+        )
+    if len(secret_key) < 32:
+        raise RuntimeError("SECRET_KEY 长度过短，生产环境必须 >= 32 位。")
+    if _contains_weak_keyword(secret_key):
+        raise RuntimeError("SECRET_KEY 包含弱关键词（dev/test/secret 等），请更换随机密钥。")
+    if secret_key in ('your-secret-key-here', 'your-secret-key-change-in-production', 'change-me-min-32-chars'):
+        raise RuntimeError("SECRET_KEY 使用了示例值，必须替换为真实的随机密钥！")
+
+    if not pair_token_pepper:
+        raise RuntimeError(
+            "PAIR_TOKEN_PEPPER 未设置！生产环境必须配置。\n"
+            "  生成方式: python3 -c 'import secrets; print(secrets.token_hex(32))'"
+        )
+    if pair_token_pepper in ('your-pair-token-pepper-here', 'change-me-min-32-chars'):
+        raise RuntimeError("PAIR_TOKEN_PEPPER 使用了示例值，必须替换为真实的随机密钥！")
+
+    effective_rate_limit_uri = rate_limit_storage_uri or redis_url or 'memory://'
+    if _is_memory_storage_uri(effective_rate_limit_uri):
+        raise RuntimeError(
+            "生产环境禁止使用 memory:// 作为限流存储，请配置 REDIS_URL 或 RATE_LIMIT_STORAGE_URI。"
+        )
+
+
 def validate_production_config():
     """验证生产环境必需的配置项。
 
     生产环境缺少必需配置时会抛出 RuntimeError。
     """
     errors = []
-    debug_value = parse_bool(os.getenv('DEBUG'), default=False)
-    secret_key_env = (os.getenv('SECRET_KEY') or '').strip()
-    pair_token_pepper = (os.getenv('PAIR_TOKEN_PEPPER') or '').strip()
-    rate_limit_storage_env = (os.getenv('RATE_LIMIT_STORAGE_URI') or '').strip()
-    redis_url = (os.getenv('REDIS_URL') or '').strip()
-
-    if not debug_value:
-        if not secret_key_env:
-            raise RuntimeError(
-                "SECRET_KEY 未设置！生产环境必须配置。\n"
-                "  生成方式: python3 -c 'import secrets; print(secrets.token_hex(32))'"
-            )
-        if len(secret_key_env) < 32:
-            raise RuntimeError("SECRET_KEY 长度过短，生产环境必须 >= 32 位。")
-        if _contains_weak_keyword(secret_key_env):
-            raise RuntimeError("SECRET_KEY 包含弱关键词（dev/test/secret 等），请更换随机密钥。")
-        if secret_key_env in ('your-secret-key-here', 'your-secret-key-change-in-production', 'change-me-min-32-chars'):
-            raise RuntimeError("SECRET_KEY 使用了示例值，必须替换为真实的随机密钥！")
-
-        if not pair_token_pepper:
-            raise RuntimeError(
-                "PAIR_TOKEN_PEPPER 未设置！生产环境必须配置。\n"
-                "  生成方式: python3 -c 'import secrets; print(secrets.token_hex(32))'"
-            )
-        if pair_token_pepper in ('your-pair-token-pepper-here', 'change-me-min-32-chars'):
-            raise RuntimeError("PAIR_TOKEN_PEPPER 使用了示例值，必须替换为真实的随机密钥！")
-
-        effective_rate_limit_uri = rate_limit_storage_env or redis_url or 'memory://'
-        if _is_memory_storage_uri(effective_rate_limit_uri):
-            raise RuntimeError(
-                "生产环境禁止使用 memory:// 作为限流存储，请配置 REDIS_URL 或 RATE_LIMIT_STORAGE_URI。"
-            )
+    _validate_production_secrets(
+        parse_bool(os.getenv('DEBUG'), default=False),
+        os.getenv('SECRET_KEY'),
+        os.getenv('PAIR_TOKEN_PEPPER'),
+        os.getenv('RATE_LIMIT_STORAGE_URI'),
+        os.getenv('REDIS_URL'),
+    )
 
     database_uri = resolve_database_uri()
     db_path = resolve_sqlite_db_path(database_uri, Path(__file__).resolve().parents[1])
@@ -1,6 +1,6 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""快速验证安全修复是否生效"""
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""快速验证安全修复是否生效"""
 import sys
 import os
 
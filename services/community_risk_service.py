@@ -1,22 +1,22 @@
-# -*- coding: utf-8 -*-
-"""
-模块二：社区风险评估服务（改进版）
-
-功能：
-C1. 社区档案管理
-C2. 脆弱性指数(VI)计算 - 使用可审计的线性指数
-C3. 社区风险得分 & 地图生成
-C4. Top N高风险社区清单
-C5. 管控建议生成（医生端）
-
-公式：
-VI_c = 1 + a*老龄率 + b*慢病率 - d*绿地率 + ...
-
-或使用回归模型：
-log E[Y_{c,t}] = α + cb(Temp_t, lag) + s(time) + DOW + u_c + v_c · Heat_t
-- u_c: 社区基线就诊水平差异
-- v_c: 社区对高温（或寒冷）的额外敏感性（"天气脆弱性"）
-"""
+# -*- coding: utf-8 -*-
+"""
+模块二：社区风险评估服务（改进版）
+
+功能：
+C1. 社区档案管理
+C2. 脆弱性指数(VI)计算 - 使用可审计的线性指数
+C3. 社区风险得分 & 地图生成
+C4. Top N高风险社区清单
+C5. 管控建议生成（医生端）
+
+公式：
+VI_c = 1 + a*老龄率 + b*慢病率 - d*绿地率 + ...
+
+或使用回归模型：
+log E[Y_{c,t}] = α + cb(Temp_t, lag) + s(time) + DOW + u_c + v_c · Heat_t
+- u_c: 社区基线就诊水平差异
+- v_c: 社区对高温（或寒冷）的额外敏感性（"天气脆弱性"）
+"""
 import hashlib
 import math
 import pandas as pd
@@ -25,8 +25,8 @@ from datetime import datetime, timedelta
 import json
 import os
 from flask import current_app, has_app_context
-
-
+
+
 class CommunityRiskService:
     """社区风险评估服务"""
     
@@ -61,13 +61,13 @@ class CommunityRiskService:
             'elderly_ratio': 1.5,      # 老龄率权重
             'chronic_disease_ratio': 1.8,  # 慢病率权重
             'green_space_ratio': -0.8,  # 绿地率权重（负向）
-            'heat_island_index': 0.5,   # 热岛效应权重
-            'medical_accessibility': -0.3  # 医疗可达性权重（负向）
-        }
-        
-        # 社区敏感性参数（v_c）
-        self.community_sensitivity = {}
-        
+            'heat_island_index': 0.5,   # 热岛效应权重
+            'medical_accessibility': -0.3  # 医疗可达性权重（负向）
+        }
+        
+        # 社区敏感性参数（v_c）
+        self.community_sensitivity = {}
+        
         # 加载社区数据
         self._load_community_profiles()
 
@@ -404,7 +404,7 @@ class CommunityRiskService:
         summary['total_records'] = total_records
         summary['unmatched_records'] = unmatched_records
         return summary
-    
+    
     def _load_community_profiles(self):
         """加载社区档案数据。
 
@@ -476,7 +476,7 @@ class CommunityRiskService:
                 'message': 'Community 表当前无法读取，本次不生成社区风险排名。',
             }
             current_app.logger.exception('Community 表查询或档案加载失败')
-    
+    
     def _setup_default_communities(self):
         """设置默认社区配置"""
         coords_map = {}
@@ -491,7 +491,7 @@ class CommunityRiskService:
             {'name': '岭背徐村', 'population': 89, 'elderly_ratio': 0.45, 'chronic_disease_ratio': 0.12},
             {'name': '徐家湾', 'population': 156, 'elderly_ratio': 0.38, 'chronic_disease_ratio': 0.15},
             {'name': '徐家咀', 'population': 98, 'elderly_ratio': 0.52, 'chronic_disease_ratio': 0.18},
-            {'name': '竹峦徐村', 'population': 112, 'elderly_ratio': 0.41, 'chronic_disease_ratio': 0.11},
+            {'name': '竹峦徐村', 'population': 112, 'elderly_ratio': 0.41, 'chronic_disease_ratio': 0.11},
             {'name': '樟树湾徐村', 'population': 78, 'elderly_ratio': 0.55, 'chronic_disease_ratio': 0.14},
             {'name': '谭家新村', 'population': 145, 'elderly_ratio': 0.35, 'chronic_disease_ratio': 0.09},
             {'name': '新屋汪家', 'population': 92, 'elderly_ratio': 0.48, 'chronic_disease_ratio': 0.16},
@@ -521,92 +521,92 @@ class CommunityRiskService:
                 'medical_accessibility': proxy['medical_accessibility'],
                 'baseline_visits': self._estimate_baseline_visits(comm['population'])
             }
-    
-    def calculate_vulnerability_index(self, community_data):
-        """
-        计算社区脆弱性指数 (Vulnerability Index)
-        
-        公式: VI_c = 1 + a*老龄率 + b*慢病率 - d*绿地率 + e*热岛指数 - f*医疗可达性
-        
-        参数:
-        - community_data: 社区数据字典
-        
-        返回:
-        - vi: 脆弱性指数（>1表示比平均更脆弱）
-        - breakdown: 各因子贡献分解
-        """
-        # 获取各因子值
-        elderly_ratio = community_data.get('elderly_ratio', 0.2)
-        chronic_ratio = community_data.get('chronic_disease_ratio', 0.15)
-        green_ratio = community_data.get('green_space_ratio', 0.1)
-        heat_island = community_data.get('heat_island_index', 0.5)
-        medical_access = community_data.get('medical_accessibility', 0.5)
-        
-        # 计算各因子贡献
-        breakdown = {
-            'elderly_contribution': self.vi_weights['elderly_ratio'] * elderly_ratio,
-            'chronic_contribution': self.vi_weights['chronic_disease_ratio'] * chronic_ratio,
-            'green_contribution': self.vi_weights['green_space_ratio'] * green_ratio,
-            'heat_island_contribution': self.vi_weights['heat_island_index'] * heat_island,
-            'medical_contribution': self.vi_weights['medical_accessibility'] * medical_access
-        }
-        
-        # 计算VI
-        vi = 1.0
-        for contribution in breakdown.values():
-            vi += contribution
-        
-        # 确保VI >= 0.5
-        vi = max(0.5, vi)
-        
-        # 确定脆弱性等级
-        if vi >= 1.5:
-            level = '高脆弱性'
-            color = 'danger'
-        elif vi >= 1.2:
-            level = '中脆弱性'
-            color = 'warning'
-        else:
-            level = '低脆弱性'
-            color = 'success'
-        
-        return {
-            'vulnerability_index': round(vi, 3),
-            'level': level,
-            'color': color,
-            'breakdown': breakdown,
-            'interpretation': f'该社区脆弱性指数为{vi:.2f}，{level}。'
-                            f'主要因素：老龄率贡献{breakdown["elderly_contribution"]:.2f}，'
-                            f'慢病率贡献{breakdown["chronic_contribution"]:.2f}'
-        }
-    
-    def calculate_community_risk_score(self, community_name, weather_rr, target_date=None):
-        """
-        计算社区风险得分
-        
-        公式: RiskScore_c(t) = MacroRR(t) × VI_c × BaselineRate_c
-        
-        参数:
-        - community_name: 社区名称
-        - weather_rr: 宏观天气相对风险
-        - target_date: 目标日期
-        
-        返回:
-        - risk_score: 风险得分
-        - details: 详细信息
-        """
-        if community_name not in self.community_profiles:
-            return {'error': f'社区 {community_name} 未找到'}
-        
-        profile = self.community_profiles[community_name]
-        
-        # 计算VI
-        vi_result = self.calculate_vulnerability_index(profile)
-        vi = vi_result['vulnerability_index']
-        
-        # 获取基线门诊率
-        baseline_rate = profile.get('baseline_visits', 5)
-        
+    
+    def calculate_vulnerability_index(self, community_data):
+        """
+        计算社区脆弱性指数 (Vulnerability Index)
+        
+        公式: VI_c = 1 + a*老龄率 + b*慢病率 - d*绿地率 + e*热岛指数 - f*医疗可达性
+        
+        参数:
+        - community_data: 社区数据字典
+        
+        返回:
+        - vi: 脆弱性指数（>1表示比平均更脆弱）
+        - breakdown: 各因子贡献分解
+        """
+        # 获取各因子值
+        elderly_ratio = community_data.get('elderly_ratio', 0.2)
+        chronic_ratio = community_data.get('chronic_disease_ratio', 0.15)
+        green_ratio = community_data.get('green_space_ratio', 0.1)
+        heat_island = community_data.get('heat_island_index', 0.5)
+        medical_access = community_data.get('medical_accessibility', 0.5)
+        
+        # 计算各因子贡献
+        breakdown = {
+            'elderly_contribution': self.vi_weights['elderly_ratio'] * elderly_ratio,
+            'chronic_contribution': self.vi_weights['chronic_disease_ratio'] * chronic_ratio,
+            'green_contribution': self.vi_weights['green_space_ratio'] * green_ratio,
+            'heat_island_contribution': self.vi_weights['heat_island_index'] * heat_island,
+            'medical_contribution': self.vi_weights['medical_accessibility'] * medical_access
+        }
+        
+        # 计算VI
+        vi = 1.0
+        for contribution in breakdown.values():
+            vi += contribution
+        
+        # 确保VI >= 0.5
+        vi = max(0.5, vi)
+        
+        # 确定脆弱性等级
+        if vi >= 1.5:
+            level = '高脆弱性'
+            color = 'danger'
+        elif vi >= 1.2:
+            level = '中脆弱性'
+            color = 'warning'
+        else:
+            level = '低脆弱性'
+            color = 'success'
+        
+        return {
+            'vulnerability_index': round(vi, 3),
+            'level': level,
+            'color': color,
+            'breakdown': breakdown,
+            'interpretation': f'该社区脆弱性指数为{vi:.2f}，{level}。'
+                            f'主要因素：老龄率贡献{breakdown["elderly_contribution"]:.2f}，'
+                            f'慢病率贡献{breakdown["chronic_contribution"]:.2f}'
+        }
+    
+    def calculate_community_risk_score(self, community_name, weather_rr, target_date=None):
+        """
+        计算社区风险得分
+        
+        公式: RiskScore_c(t) = MacroRR(t) × VI_c × BaselineRate_c
+        
+        参数:
+        - community_name: 社区名称
+        - weather_rr: 宏观天气相对风险
+        - target_date: 目标日期
+        
+        返回:
+        - risk_score: 风险得分
+        - details: 详细信息
+        """
+        if community_name not in self.community_profiles:
+            return {'error': f'社区 {community_name} 未找到'}
+        
+        profile = self.community_profiles[community_name]
+        
+        # 计算VI
+        vi_result = self.calculate_vulnerability_index(profile)
+        vi = vi_result['vulnerability_index']
+        
+        # 获取基线门诊率
+        baseline_rate = profile.get('baseline_visits', 5)
+        
         # 标准化输入RR，避免非数值污染
         try:
             weather_rr = float(weather_rr)
@@ -646,13 +646,13 @@ class CommunityRiskService:
         else:
             risk_level = '低风险'
             color = 'success'
-        
-        return {
-            'community': community_name,
-            'risk_score': round(risk_score, 2),
-            'normalized_score': round(normalized_score, 1),
-            'risk_level': risk_level,
-            'color': color,
+        
+        return {
+            'community': community_name,
+            'risk_score': round(risk_score, 2),
+            'normalized_score': round(normalized_score, 1),
+            'risk_level': risk_level,
+            'color': color,
             'components': {
                 'weather_rr': round(weather_rr, 3),
                 'vulnerability_index': vi,
@@ -665,8 +665,8 @@ class CommunityRiskService:
             'elderly_ratio': profile.get('elderly_ratio', 0),
             'expected_excess_visits': round(excess_risk_score, 1)
         }
-    
-    def generate_community_risk_map(self, weather_data, target_date=None, window_days=30, disease_filter=''):
+    
+    def generate_community_risk_map(self, weather_data, target_date=None, window_days=30, disease_filter='', precomputed_rr=None):
         """
         生成社区风险地图数据（学术增强版）。
 
@@ -702,6 +702,9 @@ class CommunityRiskService:
         lag_temperatures = self._extract_lag_temperatures(weather_data, temperature)
         if lag_temperatures:
             macro_rr, _ = dlnm.calculate_rr(temperature, lag_temperatures=lag_temperatures)
+        elif precomputed_rr is not None:
+            # 调用方（如 scenario 门面）已按同一温度算过宏观 RR，直接复用
+            macro_rr = float(precomputed_rr)
         else:
             macro_rr, _ = dlnm.calculate_rr(temperature)
 
@@ -1275,154 +1278,154 @@ class CommunityRiskService:
             ],
             'management_suggestions': management_suggestions
         }
-    
-    def _generate_management_suggestions(self, high_risk_communities, weather_data):
-        """生成管控建议（医生端）"""
-        suggestions = []
-        
-        temp = weather_data.get('temperature', 20)
-        
-        # 资源调度建议
-        if len(high_risk_communities) >= 3:
-            suggestions.append({
-                'category': '资源调配',
-                'priority': 'high',
-                'advice': f'建议向 {high_risk_communities[0]["community"]}、{high_risk_communities[1]["community"]} 等高风险社区增派医疗资源',
-                'target_communities': [c['community'] for c in high_risk_communities[:3]]
-            })
-        
-        # 巡访建议
-        for comm in high_risk_communities[:3]:
-            if comm.get('elderly_ratio', 0) > 0.4:
-                suggestions.append({
-                    'category': '健康巡访',
-                    'priority': 'high',
-                    'advice': f'{comm["community"]} 老龄化程度高({comm["elderly_ratio"]*100:.0f}%)，建议加强独居老人巡访',
-                    'target_communities': [comm['community']]
-                })
-        
-        # 温度相关建议
-        if temp > 32:
-            suggestions.append({
-                'category': '防暑措施',
-                'priority': 'high',
-                'advice': '高温天气，建议在高风险社区开放避暑点、发放防暑物资',
-                'target_communities': [c['community'] for c in high_risk_communities]
-            })
-        elif temp < 5:
-            suggestions.append({
-                'category': '防寒措施',
-                'priority': 'high',
-                'advice': '低温天气，建议检查高风险社区供暖情况、关注独居老人',
-                'target_communities': [c['community'] for c in high_risk_communities]
-            })
-        
-        # 门诊准备
-        total_excess = sum(c.get('expected_excess_visits', 0) for c in high_risk_communities)
-        if total_excess > 10:
-            suggestions.append({
-                'category': '门诊准备',
-                'priority': 'medium',
-                'advice': f'预计高风险社区额外增加约 {total_excess:.0f} 人次就诊，建议门诊做好准备',
-                'target_communities': [c['community'] for c in high_risk_communities]
-            })
-        
-        if not suggestions:
-            suggestions.append({
-                'category': '常规管理',
-                'priority': 'low',
-                'advice': '各社区风险处于正常水平，保持常规健康管理工作',
-                'target_communities': []
-            })
-        
-        return suggestions
-    
-    def update_community_sensitivity(self, community_name, heat_sensitivity=None, cold_sensitivity=None):
-        """
-        更新社区天气敏感性参数 (v_c)
-        
-        这是模型中的关键参数，表示社区对高温/寒冷的额外敏感性
-        """
-        if community_name not in self.community_sensitivity:
-            self.community_sensitivity[community_name] = {
-                'heat_sensitivity': 1.0,
-                'cold_sensitivity': 1.0
-            }
-        
-        if heat_sensitivity is not None:
-            self.community_sensitivity[community_name]['heat_sensitivity'] = heat_sensitivity
-        
-        if cold_sensitivity is not None:
-            self.community_sensitivity[community_name]['cold_sensitivity'] = cold_sensitivity
-    
-    def get_community_profile(self, community_name):
-        """获取社区档案"""
-        if community_name in self.community_profiles:
-            profile = self.community_profiles[community_name].copy()
-            vi_result = self.calculate_vulnerability_index(profile)
-            profile['vulnerability_details'] = vi_result
-            return profile
-        return None
-    
-    def get_all_communities(self):
-        """获取所有社区列表"""
-        communities = []
-        for name, profile in self.community_profiles.items():
-            vi_result = self.calculate_vulnerability_index(profile)
-            communities.append({
-                'name': name,
-                'population': profile.get('population', 0),
-                'elderly_ratio': profile.get('elderly_ratio', 0),
-                'chronic_disease_ratio': profile.get('chronic_disease_ratio', 0),
-                'vulnerability_index': vi_result['vulnerability_index'],
-                'vulnerability_level': vi_result['level']
-            })
-        
-        # 按VI排序
-        return sorted(communities, key=lambda x: x['vulnerability_index'], reverse=True)
-
-
-# 单例实例
-_community_service = None
-
-def get_community_service():
-    """获取社区风险服务单例"""
-    global _community_service
-    if _community_service is None:
-        _community_service = CommunityRiskService()
-    return _community_service
-
-
-# 测试代码
-if __name__ == '__main__':
-    print("=" * 60)
-    print("社区风险评估服务测试")
-    print("=" * 60)
-    
-    service = CommunityRiskService()
-    
-    print("\n所有社区列表:")
-    communities = service.get_all_communities()
-    for comm in communities:
-        print(f"  {comm['name']}: VI={comm['vulnerability_index']:.2f}, "
-              f"老龄率={comm['elderly_ratio']*100:.0f}%, "
-              f"级别={comm['vulnerability_level']}")
-    
-    print("\n社区风险地图生成测试:")
-    weather = {'temperature': 35, 'humidity': 80, 'aqi': 120}
-    result = service.generate_community_risk_map(weather)
-    
-    print(f"\n风险摘要:")
-    print(f"  高风险社区: {result['summary']['high_risk_count']} 个")
-    print(f"  中风险社区: {result['summary']['medium_risk_count']} 个")
-    print(f"  低风险社区: {result['summary']['low_risk_count']} 个")
-    
-    print("\n风险排名Top 3:")
-    for r in result['rankings'][:3]:
-        print(f"  {r['rank']}. {r['community']}: "
-              f"风险分数={r['risk_score']}, {r['risk_level']}")
-    
-    print("\n管控建议:")
-    for s in result['management_suggestions']:
-        print(f"  [{s['priority']}] {s['category']}: {s['advice']}")
-
+    
+    def _generate_management_suggestions(self, high_risk_communities, weather_data):
+        """生成管控建议（医生端）"""
+        suggestions = []
+        
+        temp = weather_data.get('temperature', 20)
+        
+        # 资源调度建议
+        if len(high_risk_communities) >= 3:
+            suggestions.append({
+                'category': '资源调配',
+                'priority': 'high',
+                'advice': f'建议向 {high_risk_communities[0]["community"]}、{high_risk_communities[1]["community"]} 等高风险社区增派医疗资源',
+                'target_communities': [c['community'] for c in high_risk_communities[:3]]
+            })
+        
+        # 巡访建议
+        for comm in high_risk_communities[:3]:
+            if comm.get('elderly_ratio', 0) > 0.4:
+                suggestions.append({
+                    'category': '健康巡访',
+                    'priority': 'high',
+                    'advice': f'{comm["community"]} 老龄化程度高({comm["elderly_ratio"]*100:.0f}%)，建议加强独居老人巡访',
+                    'target_communities': [comm['community']]
+                })
+        
+        # 温度相关建议
+        if temp > 32:
+            suggestions.append({
+                'category': '防暑措施',
+                'priority': 'high',
+                'advice': '高温天气，建议在高风险社区开放避暑点、发放防暑物资',
+                'target_communities': [c['community'] for c in high_risk_communities]
+            })
+        elif temp < 5:
+            suggestions.append({
+                'category': '防寒措施',
+                'priority': 'high',
+                'advice': '低温天气，建议检查高风险社区供暖情况、关注独居老人',
+                'target_communities': [c['community'] for c in high_risk_communities]
+            })
+        
+        # 门诊准备
+        total_excess = sum(c.get('expected_excess_visits', 0) for c in high_risk_communities)
+        if total_excess > 10:
+            suggestions.append({
+                'category': '门诊准备',
+                'priority': 'medium',
+                'advice': f'预计高风险社区额外增加约 {total_excess:.0f} 人次就诊，建议门诊做好准备',
+                'target_communities': [c['community'] for c in high_risk_communities]
+            })
+        
+        if not suggestions:
+            suggestions.append({
+                'category': '常规管理',
+                'priority': 'low',
+                'advice': '各社区风险处于正常水平，保持常规健康管理工作',
+                'target_communities': []
+            })
+        
+        return suggestions
+    
+    def update_community_sensitivity(self, community_name, heat_sensitivity=None, cold_sensitivity=None):
+        """
+        更新社区天气敏感性参数 (v_c)
+        
+        这是模型中的关键参数，表示社区对高温/寒冷的额外敏感性
+        """
+        if community_name not in self.community_sensitivity:
+            self.community_sensitivity[community_name] = {
+                'heat_sensitivity': 1.0,
+                'cold_sensitivity': 1.0
+            }
+        
+        if heat_sensitivity is not None:
+            self.community_sensitivity[community_name]['heat_sensitivity'] = heat_sensitivity
+        
+        if cold_sensitivity is not None:
+            self.community_sensitivity[community_name]['cold_sensitivity'] = cold_sensitivity
+    
+    def get_community_profile(self, community_name):
+        """获取社区档案"""
+        if community_name in self.community_profiles:
+            profile = self.community_profiles[community_name].copy()
+            vi_result = self.calculate_vulnerability_index(profile)
+            profile['vulnerability_details'] = vi_result
+            return profile
+        return None
+    
+    def get_all_communities(self):
+        """获取所有社区列表"""
+        communities = []
+        for name, profile in self.community_profiles.items():
+            vi_result = self.calculate_vulnerability_index(profile)
+            communities.append({
+                'name': name,
+                'population': profile.get('population', 0),
+                'elderly_ratio': profile.get('elderly_ratio', 0),
+                'chronic_disease_ratio': profile.get('chronic_disease_ratio', 0),
+                'vulnerability_index': vi_result['vulnerability_index'],
+                'vulnerability_level': vi_result['level']
+            })
+        
+        # 按VI排序
+        return sorted(communities, key=lambda x: x['vulnerability_index'], reverse=True)
+
+
+# 单例实例
+_community_service = None
+
+def get_community_service():
+    """获取社区风险服务单例"""
+    global _community_service
+    if _community_service is None:
+        _community_service = CommunityRiskService()
+    return _community_service
+
+
+# 测试代码
+if __name__ == '__main__':
+    print("=" * 60)
+    print("社区风险评估服务测试")
+    print("=" * 60)
+    
+    service = CommunityRiskService()
+    
+    print("\n所有社区列表:")
+    communities = service.get_all_communities()
+    for comm in communities:
+        print(f"  {comm['name']}: VI={comm['vulnerability_index']:.2f}, "
+              f"老龄率={comm['elderly_ratio']*100:.0f}%, "
+              f"级别={comm['vulnerability_level']}")
+    
+    print("\n社区风险地图生成测试:")
+    weather = {'temperature': 35, 'humidity': 80, 'aqi': 120}
+    result = service.generate_community_risk_map(weather)
+    
+    print(f"\n风险摘要:")
+    print(f"  高风险社区: {result['summary']['high_risk_count']} 个")
+    print(f"  中风险社区: {result['summary']['medium_risk_count']} 个")
+    print(f"  低风险社区: {result['summary']['low_risk_count']} 个")
+    
+    print("\n风险排名Top 3:")
+    for r in result['rankings'][:3]:
+        print(f"  {r['rank']}. {r['community']}: "
+              f"风险分数={r['risk_score']}, {r['risk_level']}")
+    
+    print("\n管控建议:")
+    for s in result['management_suggestions']:
+        print(f"  [{s['priority']}] {s['category']}: {s['advice']}")
+
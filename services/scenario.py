@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+综合预警场景门面
+
+把 DLNM → 社区 → 预报 → 慢病 的串行调用收拢为一次 run_scenario：
+宏观 RR 与极端事件只算一次，社区风险地图直接复用该 RR，
+避免同一温度在各子服务里重复求值。
+"""
+
+
+def _alert_level(rr, forecast_summary):
+    """按宏观 RR 与高风险天数确定综合预警级别。"""
+    high_risk_days = (forecast_summary or {}).get('high_risk_days', 0)
+    if rr >= 1.4 or high_risk_days >= 3:
+        return '红色预警'
+    if rr >= 1.2 or high_risk_days >= 1:
+        return '橙色预警'
+    return '正常'
+
+
+def run_scenario(weather_data, user_info=None, forecast_temps=None):
+    """
+    跑一轮综合预警场景。
+
+    参数:
+    - weather_data: 天气数据 {temperature, humidity, aqi, ...}
+    - user_info: 可选的个体信息 {age, chronic_diseases, ...}，传入时附带个体慢病风险
+    - forecast_temps: 可选的未来温度序列，传入时附带7天预测
+
+    返回 dict:
+    - macro_rr / rr_breakdown / extreme_events: DLNM 宏观结果（只算一次）
+    - community: 社区风险地图（复用 macro_rr）
+    - individual: 个体慢病风险（仅当提供 user_info）
+    - forecasts / forecast_summary: 7天预测（仅当提供 forecast_temps）
+    - alert_level: 综合预警级别
+    """
+    from services.dlnm_risk_service import get_dlnm_service
+    from services.community_risk_service import get_community_service
+    from services.chronic_risk_service import get_chronic_service
+    from services.forecast_service import get_forecast_service
+
+    dlnm = get_dlnm_service()
+    try:
+        temperature = float(weather_data.get('temperature', 20))
+    except (TypeError, ValueError):
+        temperature = 20.0
+
+    macro_rr, breakdown = dlnm.calculate_rr(temperature)
+    events = dlnm.identify_extreme_weather_events(temperature)
+
+    result = {
+        'macro_rr': macro_rr,
+        'rr_breakdown': breakdown,
+        'extreme_events': events,
+        'community': get_community_service().generate_community_risk_map(
+            weather_data, precomputed_rr=macro_rr
+        ),
+    }
+
+    if user_info is not None:
+        # 个体 RR 含病种/年龄修正，与宏观 RR 不可互换，仍由慢病服务自行计算
+        result['individual'] = get_chronic_service().predict_individual_risk(
+            user_info, weather_data
+        )
+
+    forecast_summary = None
+    if forecast_temps is not None:
+        forecasts, forecast_summary = get_forecast_service().generate_7day_forecast(
+            forecast_temps
+        )
+        result['forecasts'] = forecasts
+        result['forecast_summary'] = forecast_summary
+
+    result['alert_level'] = _alert_level(macro_rr, forecast_summary)
+    return result
@@ -97,7 +97,7 @@ def _action_plan(risk_label):
 
 def _generate_short_code():
     for _ in range(20):
-        code = str(secrets.randbelow(100000000)).zfill(8)
+        code = f"{secrets.randbelow(100000000):08d}"
         code_hash = hash_short_code(code)
         exists = Pair.query.filter_by(short_code_hash=code_hash).first()
         if not exists:
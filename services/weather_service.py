@@ -6,10 +6,20 @@
 import logging
 import math
 import os
+import random
+import re
+import threading
+import numpy as np
+import pandas as pd
 import requests
 from datetime import datetime, timedelta
 import json
 import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
 from statistics import mean, pstdev
 from urllib.parse import urlsplit
 from flask import current_app, has_app_context
@@ -23,6 +33,176 @@ from services.qweather_auth import (
 from services.qweather_budget import reserve_qweather_request
 from core.time_utils import today_local
 
+try:
+    import orjson  # 可选依赖：直接解析 bytes，比标准库 json 快数倍
+except ImportError:  # pragma: no cover - 环境缺失时回退标准解析
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 进程级共享连接池：和风三个端点与 Open-Meteo 复用 keep-alive 连接，
+# 避免每次 requests.get 新建 Session 并重复 TCP/TLS 握手
+_http_session = requests.Session()
+_http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+
+def _http_get(url, **kwargs):
+    """共享连接池的 GET（测试以此为 mock 缝隙）。"""
+    return _http_session.get(url, **kwargs)
+
+# 过期条目的可服务宽限倍数：age < TTL*2 时先回旧值、后台刷新
+_STALE_SERVE_FACTOR = 2
+
+# 上游失败后的冷却时长（秒）：冷却期内直接走兜底，避免持续冲击故障上游
+_BREAKER_COOLDOWN_SECONDS = 30
+
+
+# 'lon,lat' 字面量（允许两端/逗号前后空白）
+_LONLAT_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+@lru_cache(maxsize=512)
+def _parse_lon_lat_cached(location):
+    """解析 'lon,lat' 字符串；location 多数来自配置常量，结果可安全记忆化。"""
+    match = _LONLAT_RE.match(location)
+    if not match:
+        return None
+    lon = float(match.group(1))
+    lat = float(match.group(2))
+    # basic sanity check
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        return None
+    return lon, lat
+
+
+def _response_json(response):
+    """解析上游响应 JSON：优先 orjson 吃原始 bytes，否则回退 response.json()。"""
+    if orjson is not None:
+        content = getattr(response, 'content', None)
+        if isinstance(content, (bytes, bytearray)) and content:
+            return orjson.loads(content)
+    return response.json()
+
+# 和风天气错误码说明（frozen lookup table，避免每次错误都重建 dict）
+_ERROR_CODES = {
+    '400': '请求错误',
+    '401': 'API认证无效或过期',
+    '402': '超过访问次数限制',
+    '403': '无访问权限',
+    '404': '查询的数据不存在',
+    '500': '服务器内部错误',
+    '204': '请求成功，但无数据返回',
+}
+
+# 极端天气规则表：按输出顺序排列 (取值键, 触发判断, 类型, 等级, 描述模板)
+# temp_diff 的来源/置信度门控在取值阶段完成，None 表示不参与判定
+_EXTREME_WEATHER_RULES = (
+    ('temperature', lambda v: v > 35, '高温', '高', '当前温度{v}°C，极易引发中暑、心脑血管疾病'),
+    ('temperature', lambda v: v < -10, '低温', '高', '当前温度{v}°C，需警惕呼吸道疾病、冻伤'),
+    ('temp_diff', lambda v: v is not None and v > 15, '温差过大', '中', '日温差达{v}°C，易引发感冒、关节炎复发'),
+    ('humidity', lambda v: v > 85, '高湿度', '中', '湿度{v}%，不利于呼吸道疾病患者'),
+    ('wind_speed', lambda v: v > 10, '强风', '中', '风速{v}m/s，老年人应减少外出'),
+)
+
+# AQI 分级（与 bisect_left 配合：>100 轻度、>150 中度、>200 重度）
+_AQI_THRESHOLDS = (100, 150, 200)
+_AQI_TIERS = (
+    None,
+    ('轻度空气污染', '低', 'AQI达{v}，建议减少长时间户外活动'),
+    ('中度空气污染', '中', 'AQI达{v}，敏感人群应减少户外活动'),
+    ('重度空气污染', '高', 'AQI达{v}，严重影响呼吸系统，建议佩戴口罩'),
+)
+
+# 天气-疾病相关系数（静态只读映射；未来数据驱动后可替换为模型输出）
+_WEATHER_DISEASE_CORRELATIONS = MappingProxyType({
+    # 呼吸道疾病与天气关系
+    '呼吸道疾病': MappingProxyType({
+        '低温': 0.75,  # 相关系数
+        '高湿度': 0.65,
+        '空气污染': 0.85,
+        '温差大': 0.70,
+    }),
+    # 心血管疾病与天气关系
+    '心血管疾病': MappingProxyType({
+        '高温': 0.72,
+        '低温': 0.68,
+        '气压变化': 0.60,
+        '温差大': 0.65,
+    }),
+    # 关节炎与天气关系
+    '关节炎': MappingProxyType({
+        '高湿度': 0.78,
+        '低温': 0.70,
+        '气压低': 0.62,
+    }),
+    # 消化系统疾病与天气关系
+    '消化系统疾病': MappingProxyType({
+        '高温': 0.55,
+        '湿度变化': 0.45,
+    }),
+})
+
+# 健康建议静态映射（按输出顺序排列；重度/中度空气污染共用同一组建议）
+_POLLUTION_RECOMMENDATIONS = (
+    '减少户外活动，外出佩戴口罩',
+    '呼吸道疾病患者应关闭门窗，使用空气净化器',
+)
+_RECOMMENDATION_MAP = {
+    '高温': (
+        '避免在高温时段外出，及时补充水分',
+        '老年人和慢性病患者应待在阴凉处',
+    ),
+    '低温': (
+        '注意保暖，特别是头部和四肢',
+        '心血管疾病患者应避免剧烈运动',
+    ),
+    '温差过大': (
+        '早晚注意增减衣物',
+        '关节炎患者应注意关节保暖',
+    ),
+    '重度空气污染': _POLLUTION_RECOMMENDATIONS,
+    '中度空气污染': _POLLUTION_RECOMMENDATIONS,
+    '高湿度': (
+        '注意室内通风除湿',
+        '呼吸道疾病患者应谨慎外出',
+    ),
+}
+
+# Open-Meteo 各端点的固定查询参数模板（经纬度等按请求补充，避免每次重建常量项）
+_OPENMETEO_CURRENT_PARAMS = {
+    'current': 'temperature_2m,relative_humidity_2m,surface_pressure,weather_code,wind_speed_10m',
+    'daily': 'temperature_2m_max,temperature_2m_min',
+    'forecast_days': 1,
+    'timezone': 'Asia/Shanghai',
+}
+_OPENMETEO_HOURLY_PARAMS = {
+    'hourly': 'temperature_2m',
+    'forecast_days': 2,
+    'timezone': 'Asia/Shanghai',
+}
+_OPENMETEO_DAILY_PARAMS = {
+    'daily': 'temperature_2m_max,temperature_2m_min,precipitation_probability_max,weather_code',
+    'timezone': 'Asia/Shanghai',
+}
+_OPENMETEO_NOWCAST_PARAMS = {
+    'hourly': 'precipitation_probability,precipitation,temperature_2m,weather_code',
+    'timezone': 'Asia/Shanghai',
+}
+_QWEATHER_AIR_PARAMS = {'lang': 'zh'}
+
+# 模拟数据的候选天气/风向（frozen lookup table）
+_MOCK_DAY_CONDITIONS = ('晴', '多云', '阴', '小雨', '晴转多云')
+_MOCK_NIGHT_CONDITIONS = ('晴', '多云', '阴')
+_MOCK_WIND_DIRS = ('东风', '南风', '西风', '北风', '东南风')
+
+# Open-Meteo 天气代码转中文描述（frozen lookup table）
+_OPENMETEO_WEATHER_MAP = {
+    0: '晴', 1: '晴', 2: '多云', 3: '阴',
+    45: '雾', 48: '雾', 51: '小雨', 53: '中雨', 55: '大雨',
+    61: '小雨', 63: '中雨', 65: '大雨', 71: '小雪', 73: '中雪', 75: '大雪',
+    80: '阵雨', 81: '阵雨', 82: '暴雨', 95: '雷阵雨', 96: '雷雨夹冰雹', 99: '强雷雨',
+}
+
 class WeatherService:
     """天气服务类"""
     
@@ -34,9 +214,21 @@ class WeatherService:
         self.qweather_jwt_private_key_path = None
         self.api_base_url = None
         self.city_map = {}
+        self._city_keys = ()
         self.default_location = '116.20,29.27'  # 都昌县
         self.canonical_location = self.default_location
         self.use_openmeteo_fallback = True  # 启用Open-Meteo备用API
+        # (endpoint, city) -> (monotonic_ts, result)，TTL 内直接复用上游结果
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # stale-while-revalidate：后台刷新线程池按需创建，in-flight 键防重复提交
+        self._refresh_pool = None
+        self._refresh_inflight = set()
+        # endpoint -> monotonic 恢复时间；最近失败的上游在冷却期内直接跳过
+        self._breaker = {}
+        self._breaker_lock = threading.Lock()
+        self.cache_ttl_seconds = 300
+        self.forecast_cache_ttl_seconds = 1800
 
         self._load_config()
 
@@ -70,6 +262,8 @@ class WeatherService:
             configured_api_base = os.getenv('QWEATHER_API_BASE')
         self.api_base_url = (configured_api_base or '').strip()
         self.city_map = app_config.get('CITY_LOCATION_MAP') or {}
+        # _get_location 每次请求都会走模糊匹配，一次性固化键元组避免热路径上重复迭代 dict
+        self._city_keys = tuple(self.city_map.keys())
         self.default_location = (
             app_config.get('DEFAULT_LOCATION')
             or os.getenv('DEFAULT_LOCATION', self.default_location)
@@ -79,6 +273,111 @@ class WeatherService:
             or os.getenv('QWEATHER_CANONICAL_LOCATION')
             or self.default_location
         )
+        self.cache_ttl_seconds = self._parse_ttl_seconds(
+            app_config.get('WEATHER_CACHE_TTL') or os.getenv('WEATHER_CACHE_TTL'),
+            default=300,
+        )
+        self.forecast_cache_ttl_seconds = self._parse_ttl_seconds(
+            app_config.get('WEATHER_FORECAST_CACHE_TTL') or os.getenv('WEATHER_FORECAST_CACHE_TTL'),
+            default=1800,
+        )
+
+    @staticmethod
+    def _parse_ttl_seconds(value, default):
+        """解析缓存 TTL（秒），非法值回退默认。"""
+        try:
+            ttl = int(value)
+        except (TypeError, ValueError):
+            return default
+        return ttl if ttl >= 0 else default
+
+    @staticmethod
+    def _is_cacheable_weather(result):
+        """判断结果是否可缓存：mock/兜底数据不入缓存，避免固化坏数据。"""
+        if isinstance(result, dict):
+            return not result.get('is_mock')
+        if isinstance(result, list):
+            return bool(result) and all(
+                isinstance(entry, dict) and not entry.get('is_mock', True)
+                for entry in result
+            )
+        return False
+
+    def _cached(self, key, ttl, fn):
+        """TTL 内存缓存（stale-while-revalidate）。
+
+        TTL 内直接命中；过期但仍在宽限窗（TTL 的 2 倍）内时，先返回旧值并
+        提交后台刷新，让用户请求始终命中内存；完全过期才同步重新获取。
+        """
+        if ttl <= 0:
+            return fn()
+        now = time.monotonic()
+        stale_value = None
+        serve_stale = False
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < ttl:
+                    return entry[1]
+                if age < ttl * _STALE_SERVE_FACTOR:
+                    stale_value = entry[1]
+                    serve_stale = True
+        if serve_stale:
+            self._schedule_refresh(key, fn)
+            return stale_value
+        result = fn()
+        if self._is_cacheable_weather(result):
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def _schedule_refresh(self, key, fn):
+        """提交一次后台刷新（同一键同时只允许一个刷新任务在途）。"""
+        with self._cache_lock:
+            if key in self._refresh_inflight:
+                return
+            self._refresh_inflight.add(key)
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix='weather-refresh'
+                )
+            pool = self._refresh_pool
+        pool.submit(self._refresh_entry, key, fn)
+
+    def _refresh_entry(self, key, fn):
+        """后台刷新缓存条目：仅在成功取得可缓存结果时替换旧值。"""
+        try:
+            result = fn()
+            if self._is_cacheable_weather(result):
+                with self._cache_lock:
+                    self._cache[key] = (time.monotonic(), result)
+        except Exception as exc:
+            logger.warning("后台刷新天气缓存失败: key=%s err=%s", key, exc)
+        finally:
+            with self._cache_lock:
+                self._refresh_inflight.discard(key)
+
+    def _breaker_open(self, endpoint):
+        """端点是否处于失败冷却期（到期自动解除）。"""
+        with self._breaker_lock:
+            resume_at = self._breaker.get(endpoint)
+            if resume_at is None:
+                return False
+            if time.monotonic() >= resume_at:
+                del self._breaker[endpoint]
+                return False
+            return True
+
+    def _trip_breaker(self, endpoint):
+        """上游失败：记录冷却截止时间。"""
+        with self._breaker_lock:
+            self._breaker[endpoint] = time.monotonic() + _BREAKER_COOLDOWN_SECONDS
+
+    def _reset_breaker(self, endpoint):
+        """上游恢复：清除冷却标记。"""
+        with self._breaker_lock:
+            self._breaker.pop(endpoint, None)
 
     def _qweather_auth_config(self):
         """返回当前实例的认证配置，不包含任何日志输出。"""
@@ -114,38 +413,28 @@ class WeatherService:
         if self._parse_lon_lat(city):
             return city
 
-        # 首先从映射中查找
-        if city in self.city_map:
+        # 首先精确命中映射（最常见路径，单次哈希查找）
+        try:
             return self.city_map[city]
-        
-        # 尝试模糊匹配
-        for key in self.city_map:
+        except KeyError:
+            pass
+
+        # 尝试模糊匹配（遍历预构建的键元组，比迭代 dict 更快）
+        for key in self._city_keys:
             if city in key or key in city:
                 return self.city_map[key]
-        
+
         # 返回默认位置
         return self.default_location
 
     def _parse_lon_lat(self, location: str):
         """Parse 'lon,lat' string safely. Return (lon, lat) as floats or None."""
-        if not location or ',' not in str(location):
-            return None
-        parts = [p.strip() for p in str(location).split(',')]
-        if len(parts) != 2:
-            return None
-        try:
-            lon = float(parts[0])
-            lat = float(parts[1])
-        except ValueError:
+        if not location:
             return None
-        # basic sanity check
-        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
-            return None
-        return lon, lat
+        return _parse_lon_lat_cached(str(location))
 
-    def _get_fallback_weather(self, city, logger=None):
+    def _get_fallback_weather(self, city):
         """按 Open-Meteo、Mock 的顺序返回兜底天气。"""
-        logger = logger or logging.getLogger(__name__)
         if self.use_openmeteo_fallback:
             logger.info("尝试使用Open-Meteo备用API...")
             openmeteo_result = self._get_openmeteo_weather(city)
@@ -158,10 +447,21 @@ class WeatherService:
     def get_current_weather(self, city="都昌"):
         """
         获取当前天气数据，依次尝试和风天气、Open-Meteo 与模拟数据。
+        结果按 (endpoint, city) 做 TTL 内存缓存，mock 兜底不入缓存。
         """
-        logger = logging.getLogger(__name__)
+        return self._cached(
+            ('weather_now', str(city)),
+            self.cache_ttl_seconds,
+            lambda: self._fetch_current_weather(city),
+        )
+
+    def _fetch_current_weather(self, city="都昌"):
+        """实际执行当前天气获取（不经过缓存）。"""
         # 尝试调用和风天气API
         if self._qweather_is_configured():
+            if self._breaker_open('weather_now'):
+                logger.info("和风实况处于失败冷却期，直接使用备用源")
+                return self._get_fallback_weather(city)
             try:
                 # 获取城市location
                 location = self._get_location(city)
@@ -175,9 +475,9 @@ class WeatherService:
                 headers = self._qweather_headers()
                 if not reserve_qweather_request('weather_now'):
                     logger.warning("和风天气月度额度保护：跳过实况请求并使用备用源")
-                    return self._get_fallback_weather(city, logger)
+                    return self._get_fallback_weather(city)
                 start_ts = time.perf_counter()
-                weather_response = requests.get(
+                weather_response = _http_get(
                     weather_url,
                     params=weather_params,
                     headers=headers,
@@ -190,14 +490,18 @@ class WeatherService:
                     if weather_response.status_code == 401:
                         invalidate_qweather_token()
                     logger.warning("API HTTP状态码: %s，尝试备用API", weather_response.status_code)
-                    return self._get_fallback_weather(city, logger)
+                    self._trip_breaker('weather_now')
+                    return self._get_fallback_weather(city)
                 
                 try:
-                    weather_data = weather_response.json()
+                    weather_data = _response_json(weather_response)
                 except Exception as json_error:
                     logger.warning("JSON解析失败: %s，尝试备用API", json_error)
-                    logger.debug("响应内容: %s", weather_response.text[:200])
-                    return self._get_fallback_weather(city, logger)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        # .text 会整体解码响应体，仅在 DEBUG 打开时才付这笔成本
+                        logger.debug("响应内容: %s", weather_response.text[:200])
+                    self._trip_breaker('weather_now')
+                    return self._get_fallback_weather(city)
                 
                 # 检查返回状态
                 code = weather_data.get('code')
@@ -206,17 +510,19 @@ class WeatherService:
                         invalidate_qweather_token()
                     if code is None:
                         logger.warning("和风天气API响应格式异常，尝试备用API")
-                        logger.debug("响应内容: %s", str(weather_data)[:200])
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("响应内容: %s", str(weather_data)[:200])
                     else:
                         error_msg = self._get_error_message(code)
                         logger.warning("和风天气API返回错误[%s]: %s，尝试备用API", code, error_msg)
-                    return self._get_fallback_weather(city, logger)
+                    self._trip_breaker('weather_now')
+                    return self._get_fallback_weather(city)
                 
                 # 解析天气数据
                 now = weather_data.get('now')
                 if not isinstance(now, dict):
                     logger.warning("和风天气API缺少实况字段，尝试备用API")
-                    return self._get_fallback_weather(city, logger)
+                    return self._get_fallback_weather(city)
                 temp_val = self._safe_float(now.get('temp'))
                 humidity_val = self._safe_float(now.get('humidity'))
                 if (
@@ -226,7 +532,7 @@ class WeatherService:
                     or not math.isfinite(humidity_val)
                 ):
                     logger.warning("和风天气API关键实况字段不完整，尝试备用API")
-                    return self._get_fallback_weather(city, logger)
+                    return self._get_fallback_weather(city)
                 result = {
                     'temperature': temp_val,
                     # 优先使用真实日极值，必要时回退到小时序列推导
@@ -244,7 +550,8 @@ class WeatherService:
                     'pm25': None,
                     'aqi': None,
                     'location': city,
-                    'update_time': now.get('obsTime', datetime.now().strftime('%Y-%m-%d %H:%M')),
+                    # or 短路：obsTime 存在（绝大多数情况）时不触发 strftime
+                    'update_time': now.get('obsTime') or datetime.now().strftime('%Y-%m-%d %H:%M'),
                     'is_mock': False,
                     'data_source': 'QWeather'
                 }
@@ -258,44 +565,39 @@ class WeatherService:
                     result['temperature_range_confidence'] = range_confidence
                 
                 # 空气质量失败不影响实时天气主链路。
-                air_quality = self._get_qweather_air_quality(location, logger)
+                air_quality = self._get_qweather_air_quality(location)
                 if air_quality:
                     result.update(air_quality)
                 
                 logger.info("成功获取%s的真实天气数据 (温度: %s°C)", city, result['temperature'])
+                self._reset_breaker('weather_now')
                 return result
                     
             except QWeatherAuthError as auth_error:
                 logger.warning("和风天气认证失败: %s，尝试备用API", auth_error)
+                self._trip_breaker('weather_now')
             except requests.exceptions.Timeout:
                 logger.warning("和风天气API请求超时，尝试备用API")
+                self._trip_breaker('weather_now')
             except requests.exceptions.ConnectionError:
                 logger.warning("网络连接失败，尝试备用API")
+                self._trip_breaker('weather_now')
             except requests.exceptions.RequestException as e:
                 logger.warning("和风天气API请求异常: %s，尝试备用API", e)
+                self._trip_breaker('weather_now')
             except Exception as e:
                 logger.exception("和风天气API调用失败: %s，尝试备用API", e)
         else:
             logger.warning("未配置和风天气API，尝试备用API")
         
-        return self._get_fallback_weather(city, logger)
+        return self._get_fallback_weather(city)
     
     def _get_error_message(self, code):
         """获取错误码对应的说明"""
-        error_codes = {
-            '400': '请求错误',
-            '401': 'API认证无效或过期',
-            '402': '超过访问次数限制',
-            '403': '无访问权限',
-            '404': '查询的数据不存在',
-            '500': '服务器内部错误',
-            '204': '请求成功，但无数据返回'
-        }
-        return error_codes.get(str(code), f'未知错误(代码:{code})')
+        return _ERROR_CODES.get(str(code), f'未知错误(代码:{code})')
 
-    def _get_qweather_air_quality(self, location, logger=None):
+    def _get_qweather_air_quality(self, location):
         """调用新版空气质量接口，返回本地标准 AQI 与 PM2.5。"""
-        logger = logger or logging.getLogger(__name__)
         coordinates = self._parse_lon_lat(location)
         if not coordinates:
             logger.debug("空气质量 v1 需要经纬度，当前 location 无法解析")
@@ -316,9 +618,9 @@ class WeatherService:
                 logger.debug("和风天气月度额度保护：跳过空气质量请求")
                 return {}
             start_ts = time.perf_counter()
-            response = requests.get(
+            response = _http_get(
                 air_url,
-                params={'lang': 'zh'},
+                params=_QWEATHER_AIR_PARAMS,
                 headers=headers,
                 timeout=10,
             )
@@ -333,7 +635,7 @@ class WeatherService:
                 logger.debug("空气质量 v1 HTTP 状态码: %s", response.status_code)
                 return {}
 
-            payload = response.json()
+            payload = _response_json(response)
             if not isinstance(payload, dict):
                 return {}
 
@@ -399,7 +701,6 @@ class WeatherService:
     
     def _get_openmeteo_weather(self, city="都昌"):
         """使用Open-Meteo免费API获取天气数据（无需API Key）"""
-        logger = logging.getLogger(__name__)
         try:
             location = self._get_location(city)
             parsed = self._parse_lon_lat(location)
@@ -410,24 +711,17 @@ class WeatherService:
             
             # Open-Meteo API - 完全免费，无需注册
             url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'current': 'temperature_2m,relative_humidity_2m,surface_pressure,weather_code,wind_speed_10m',
-                'daily': 'temperature_2m_max,temperature_2m_min',
-                'forecast_days': 1,
-                'timezone': 'Asia/Shanghai'
-            }
+            params = {**_OPENMETEO_CURRENT_PARAMS, 'latitude': lat, 'longitude': lon}
             
             start_ts = time.perf_counter()
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_get(url, params=params, timeout=10)
             _record_external_api_timing(
                 'openmeteo_now',
                 (time.perf_counter() - start_ts) * 1000,
                 response.status_code
             )
             if response.status_code == 200:
-                data = response.json()
+                data = _response_json(response)
                 current = data.get('current', {})
                 
                 # 天气代码转中文
@@ -485,17 +779,11 @@ class WeatherService:
 
     def _weather_code_to_text(self, weather_code):
         """Open-Meteo 天气代码转中文描述"""
-        weather_map = {
-            0: '晴', 1: '晴', 2: '多云', 3: '阴',
-            45: '雾', 48: '雾', 51: '小雨', 53: '中雨', 55: '大雨',
-            61: '小雨', 63: '中雨', 65: '大雨', 71: '小雪', 73: '中雪', 75: '大雪',
-            80: '阵雨', 81: '阵雨', 82: '暴雨', 95: '雷阵雨', 96: '雷雨夹冰雹', 99: '强雷雨'
-        }
         try:
             code = int(weather_code)
         except Exception:
             return '多云'
-        return weather_map.get(code, '多云')
+        return _OPENMETEO_WEATHER_MAP.get(code, '多云')
 
     def _safe_float(self, value, default=None):
         try:
@@ -531,7 +819,6 @@ class WeatherService:
 
     def _get_qweather_hourly_extremes(self, location):
         """从和风 24 小时温度序列推导温差。"""
-        logger = logging.getLogger(__name__)
         if not self._qweather_is_configured():
             return None, None, 'none'
         try:
@@ -543,7 +830,7 @@ class WeatherService:
             if not reserve_qweather_request('weather_24h_current_range'):
                 return None, None, 'none'
             start_ts = time.perf_counter()
-            response = requests.get(
+            response = _http_get(
                 hourly_url,
                 params=hourly_params,
                 headers=headers,
@@ -558,7 +845,7 @@ class WeatherService:
                 if response.status_code == 401:
                     invalidate_qweather_token()
                 return None, None, 'none'
-            payload = response.json()
+            payload = _response_json(response)
             if payload.get('code') != '200':
                 if str(payload.get('code')) == '401':
                     invalidate_qweather_token()
@@ -572,18 +859,11 @@ class WeatherService:
 
     def _get_openmeteo_hourly_extremes(self, lon, lat):
         """从 Open-Meteo 小时序列推导温差（优先当天样本，不足则退回24h样本）。"""
-        logger = logging.getLogger(__name__)
         try:
             url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'hourly': 'temperature_2m',
-                'forecast_days': 2,
-                'timezone': 'Asia/Shanghai'
-            }
+            params = {**_OPENMETEO_HOURLY_PARAMS, 'latitude': lat, 'longitude': lon}
             start_ts = time.perf_counter()
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_get(url, params=params, timeout=10)
             _record_external_api_timing(
                 'openmeteo_now_hourly',
                 (time.perf_counter() - start_ts) * 1000,
@@ -591,7 +871,7 @@ class WeatherService:
             )
             if response.status_code != 200:
                 return None, None, 'none'
-            payload = response.json()
+            payload = _response_json(response)
             hourly = payload.get('hourly') or {}
             temps = hourly.get('temperature_2m') or []
             time_list = hourly.get('time') or []
@@ -620,7 +900,6 @@ class WeatherService:
 
     def _get_qweather_today_extremes(self, location):
         """获取和风当日最高/最低温（用于修正实况无日温差的问题）。"""
-        logger = logging.getLogger(__name__)
         if not self._qweather_is_configured():
             return None, None
         try:
@@ -632,7 +911,7 @@ class WeatherService:
             if not reserve_qweather_request('weather_7d_current_range'):
                 return None, None
             start_ts = time.perf_counter()
-            response = requests.get(
+            response = _http_get(
                 forecast_url,
                 params=forecast_params,
                 headers=headers,
@@ -647,7 +926,7 @@ class WeatherService:
                 if response.status_code == 401:
                     invalidate_qweather_token()
                 return None, None
-            payload = response.json()
+            payload = _response_json(response)
             if payload.get('code') != '200':
                 if str(payload.get('code')) == '401':
                     invalidate_qweather_token()
@@ -713,7 +992,6 @@ class WeatherService:
 
     def get_qweather_daily_forecast(self, city="都昌", days=7):
         """只获取和风天气 7 日预报，不启用备用源或模拟数据。"""
-        logger = logging.getLogger(__name__)
         try:
             days = max(1, min(int(days or 7), 7))
         except Exception:
@@ -738,7 +1016,7 @@ class WeatherService:
                 meta['error'] = 'qweather_budget_exhausted'
                 return {'success': False, 'daily': [], 'meta': meta}
             start_ts = time.perf_counter()
-            response = requests.get(
+            response = _http_get(
                 forecast_url,
                 params=forecast_params,
                 headers=headers,
@@ -757,7 +1035,7 @@ class WeatherService:
                 return {'success': False, 'daily': [], 'meta': meta}
 
             try:
-                payload = response.json()
+                payload = _response_json(response)
             except Exception as exc:
                 meta['error'] = 'invalid_json'
                 logger.warning("和风-only预报JSON解析失败: %s", exc)
@@ -815,7 +1093,6 @@ class WeatherService:
 
     def _get_openmeteo_forecast(self, city="都昌", days=7):
         """Open-Meteo 逐日预报（用于多模型融合）"""
-        logger = logging.getLogger(__name__)
         try:
             location = self._get_location(city)
             parsed = self._parse_lon_lat(location)
@@ -825,14 +1102,9 @@ class WeatherService:
             lon, lat = parsed
 
             url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                'latitude': lat,
-                'longitude': lon,
-                'daily': 'temperature_2m_max,temperature_2m_min,precipitation_probability_max,weather_code',
-                'timezone': 'Asia/Shanghai'
-            }
+            params = {**_OPENMETEO_DAILY_PARAMS, 'latitude': lat, 'longitude': lon}
             start_ts = time.perf_counter()
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_get(url, params=params, timeout=10)
             _record_external_api_timing(
                 'openmeteo_forecast_daily',
                 (time.perf_counter() - start_ts) * 1000,
@@ -841,7 +1113,7 @@ class WeatherService:
             if response.status_code != 200:
                 return []
 
-            payload = response.json()
+            payload = _response_json(response)
             daily = payload.get('daily') or {}
             dates = daily.get('time') or []
             tmax_list = daily.get('temperature_2m_max') or []
@@ -960,7 +1232,6 @@ class WeatherService:
 
     def get_short_term_nowcast(self, city="都昌", hours=6):
         """获取未来小时级降水时间轴（短临交互数据）。"""
-        logger = logging.getLogger(__name__)
         hours = max(1, min(int(hours or 6), 24))
         location = self._get_location(city)
         parsed = self._parse_lon_lat(location)
@@ -976,14 +1247,13 @@ class WeatherService:
         try:
             url = "https://api.open-meteo.com/v1/forecast"
             params = {
+                **_OPENMETEO_NOWCAST_PARAMS,
                 'latitude': lat,
                 'longitude': lon,
-                'hourly': 'precipitation_probability,precipitation,temperature_2m,weather_code',
                 'forecast_hours': hours,
-                'timezone': 'Asia/Shanghai'
             }
             start_ts = time.perf_counter()
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_get(url, params=params, timeout=10)
             _record_external_api_timing(
                 'openmeteo_nowcast_hourly',
                 (time.perf_counter() - start_ts) * 1000,
@@ -996,7 +1266,7 @@ class WeatherService:
                     'reason': f'http_{response.status_code}',
                     'timeline': []
                 }
-            payload = response.json()
+            payload = _response_json(response)
             hourly = payload.get('hourly') or {}
             times = hourly.get('time') or []
             pops = hourly.get('precipitation_probability') or []
@@ -1067,7 +1337,6 @@ class WeatherService:
     
     def _get_mock_weather(self):
         """获取模拟天气数据（最后备用方案）"""
-        import random
         temp = random.uniform(10, 25)
         return {
             'temperature': round(temp, 1),
@@ -1087,12 +1356,55 @@ class WeatherService:
         """
         获取未来天气预报 - 使用和风天气7天预报API
         如果API调用失败，返回模拟数据
+        结果按 (endpoint, city, days) 做 TTL 内存缓存，模拟预报不入缓存。
         """
-        logger = logging.getLogger(__name__)
+        return self._cached(
+            ('weather_forecast', str(city), days),
+            self.forecast_cache_ttl_seconds,
+            lambda: self._fetch_weather_forecast(city, days),
+        )
+
+    def _fetch_weather_forecast(self, city="都昌", days=7):
+        """实际执行天气预报获取（不经过缓存）。"""
         # 限制最多7天
         days = min(days, 7)
+
+        if self.use_openmeteo_fallback:
+            # 和风与 Open-Meteo 两路互相独立，用工作线程重叠两次上游 RTT。
+            # 和风一路留在调用线程执行，保持额度预占与请求级指标的上下文语义。
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                openmeteo_future = pool.submit(self._get_openmeteo_forecast, city, days)
+                qweather_forecast = self._get_qweather_forecast_entries(city, days)
+                openmeteo_forecast = openmeteo_future.result()
+        else:
+            qweather_forecast = self._get_qweather_forecast_entries(city, days)
+            openmeteo_forecast = []
+
+        # 多模型融合（优先）
+        merged = self._merge_multimodel_forecast(qweather_forecast, openmeteo_forecast, days=days)
+        if merged:
+            logger.info(
+                "多模型融合预报成功: city=%s days=%s qweather=%s openmeteo=%s",
+                city, len(merged), len(qweather_forecast), len(openmeteo_forecast)
+            )
+            return merged
+
+        if qweather_forecast:
+            return qweather_forecast
+        if openmeteo_forecast:
+            return openmeteo_forecast
+
+        # 返回模拟预报数据
+        logger.warning("所有预报源均不可用，使用模拟预报")
+        return self._get_mock_forecast(days)
+
+    def _get_qweather_forecast_entries(self, city, days):
+        """获取和风 7 日预报条目（失败时返回空列表，由上层决定兜底）。"""
         qweather_forecast = []
         if self._qweather_is_configured():
+            if self._breaker_open('weather_7d_forecast'):
+                logger.info("和风预报处于失败冷却期，跳过和风源")
+                return qweather_forecast
             try:
                 location = self._get_location(city)
 
@@ -1106,7 +1418,7 @@ class WeatherService:
                 if not reserve_qweather_request('weather_7d_forecast'):
                     raise RuntimeError('qweather_budget_exhausted')
                 start_ts = time.perf_counter()
-                response = requests.get(
+                response = _http_get(
                     forecast_url,
                     params=forecast_params,
                     headers=headers,
@@ -1118,87 +1430,77 @@ class WeatherService:
                     response.status_code
                 )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _response_json(response)
                     if data.get('code') == '200' and 'daily' in data:
                         qweather_forecast = [
                             self._normalize_qweather_daily_entry(day)
                             for day in data['daily'][:days]
                         ]
                         logger.info("成功获取%s的和风%s天预报数据", city, len(qweather_forecast))
+                        self._reset_breaker('weather_7d_forecast')
                     else:
                         if str(data.get('code')) == '401':
                             invalidate_qweather_token()
                         error_msg = self._get_error_message(data.get('code', 'unknown'))
                         logger.warning("和风预报获取失败: %s", error_msg)
+                        self._trip_breaker('weather_7d_forecast')
                 else:
                     if response.status_code == 401:
                         invalidate_qweather_token()
                     logger.warning("和风预报HTTP状态码: %s", response.status_code)
+                    self._trip_breaker('weather_7d_forecast')
             except QWeatherAuthError as auth_error:
                 logger.warning("和风预报认证失败: %s", auth_error)
+                self._trip_breaker('weather_7d_forecast')
             except requests.exceptions.Timeout:
                 logger.warning("和风预报请求超时")
+                self._trip_breaker('weather_7d_forecast')
             except requests.exceptions.ConnectionError:
                 logger.warning("和风预报网络连接失败")
+                self._trip_breaker('weather_7d_forecast')
             except requests.exceptions.RequestException as e:
                 logger.warning("和风预报请求异常: %s", e)
+                self._trip_breaker('weather_7d_forecast')
             except Exception as e:
                 logger.exception("和风预报调用失败: %s", e)
         else:
             logger.info("未配置和风预报Key，跳过和风源")
-
-        openmeteo_forecast = []
-        if self.use_openmeteo_fallback:
-            openmeteo_forecast = self._get_openmeteo_forecast(city, days=days)
-
-        # 多模型融合（优先）
-        merged = self._merge_multimodel_forecast(qweather_forecast, openmeteo_forecast, days=days)
-        if merged:
-            logger.info(
-                "多模型融合预报成功: city=%s days=%s qweather=%s openmeteo=%s",
-                city, len(merged), len(qweather_forecast), len(openmeteo_forecast)
-            )
-            return merged
-
-        if qweather_forecast:
-            return qweather_forecast
-        if openmeteo_forecast:
-            return openmeteo_forecast
-
-        # 返回模拟预报数据
-        logger.warning("所有预报源均不可用，使用模拟预报")
-        return self._get_mock_forecast(days)
+        return qweather_forecast
     
     def _get_mock_forecast(self, days=7):
-        """生成模拟的天气预报数据"""
-        import random
-        
-        forecast = []
-        base_temp = random.uniform(10, 25)
-        
+        """生成模拟的天气预报数据（随机数一次性批量采样，避免逐项调用 random）"""
+        rng = np.random.default_rng()
+        base_temp = rng.uniform(10, 25)
+
+        # 温度有一定连续性：逐日 ±2 的随机游走
+        walk = np.concatenate(([0.0], np.cumsum(rng.uniform(-2, 2, max(days - 1, 0)))))
+        variation = rng.uniform(-3, 3, days)
+        temp_max = base_temp + walk + variation + rng.uniform(3, 8, days)
+        temp_min = base_temp + walk + variation - rng.uniform(2, 5, days)
+        humidity = rng.uniform(40, 80, days)
+        wind_speed = rng.uniform(1, 8, days)
+        uv_index = rng.integers(1, 11, days)
+        condition_idx = rng.integers(0, len(_MOCK_DAY_CONDITIONS), days)
+        night_idx = rng.integers(0, len(_MOCK_NIGHT_CONDITIONS), days)
+        wind_dir_idx = rng.integers(0, len(_MOCK_WIND_DIRS), days)
+
         base_date = today_local()
-        for i in range(days):
-            date = base_date + timedelta(days=i)
-            temp_variation = random.uniform(-3, 3)
-            
-            forecast.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'temperature_max': round(base_temp + temp_variation + random.uniform(3, 8), 1),
-                'temperature_min': round(base_temp + temp_variation - random.uniform(2, 5), 1),
-                'condition': random.choice(['晴', '多云', '阴', '小雨', '晴转多云']),
-                'condition_night': random.choice(['晴', '多云', '阴']),
-                'humidity': round(random.uniform(40, 80), 0),
-                'wind_dir': random.choice(['东风', '南风', '西风', '北风', '东南风']),
-                'wind_speed': round(random.uniform(1, 8), 1),
-                'uv_index': str(random.randint(1, 10)),
+        return [
+            {
+                'date': (base_date + timedelta(days=i)).strftime('%Y-%m-%d'),
+                'temperature_max': round(float(temp_max[i]), 1),
+                'temperature_min': round(float(temp_min[i]), 1),
+                'condition': _MOCK_DAY_CONDITIONS[condition_idx[i]],
+                'condition_night': _MOCK_NIGHT_CONDITIONS[night_idx[i]],
+                'humidity': round(float(humidity[i]), 0),
+                'wind_dir': _MOCK_WIND_DIRS[wind_dir_idx[i]],
+                'wind_speed': round(float(wind_speed[i]), 1),
+                'uv_index': str(int(uv_index[i])),
                 'sunrise': '06:30',
                 'sunset': '18:00'
-            })
-            
-            # 温度有一定连续性
-            base_temp += random.uniform(-2, 2)
-        
-        return forecast
+            }
+            for i in range(days)
+        ]
     
     def identify_extreme_weather(self, weather_data):
         """
@@ -1212,130 +1514,63 @@ class WeatherService:
         - 重度污染：AQI>200
         """
         extreme_conditions = []
-        temp_now = self._safe_float(weather_data.get('temperature'), 0.0)
-        humidity = self._safe_float(weather_data.get('humidity'), 0.0)
-        wind_speed = self._safe_float(weather_data.get('wind_speed'), 0.0)
+        values = {
+            'temperature': self._safe_float(weather_data.get('temperature'), 0.0),
+            'humidity': self._safe_float(weather_data.get('humidity'), 0.0),
+            'wind_speed': self._safe_float(weather_data.get('wind_speed'), 0.0),
+            'temp_diff': self._usable_temp_diff(weather_data),
+        }
 
-        # 高温
-        if temp_now > 35:
-            extreme_conditions.append({
-                'type': '高温',
-                'severity': '高',
-                'description': f"当前温度{temp_now}°C，极易引发中暑、心脑血管疾病"
-            })
-        
-        # 低温
-        if temp_now < -10:
+        # 单趟规则表扫描，保持与旧 if 链一致的输出顺序
+        for key, predicate, cond_type, severity, template in _EXTREME_WEATHER_RULES:
+            value = values[key]
+            if predicate(value):
+                extreme_conditions.append({
+                    'type': cond_type,
+                    'severity': severity,
+                    'description': template.format(v=value),
+                })
+
+        # 空气污染分级（bisect 替代阈值 if 链）
+        aqi = self._safe_float(weather_data.get('aqi'), 0.0)
+        tier = _AQI_TIERS[bisect_left(_AQI_THRESHOLDS, aqi)]
+        if tier is not None:
+            cond_type, severity, template = tier
             extreme_conditions.append({
-                'type': '低温',
-                'severity': '高',
-                'description': f"当前温度{temp_now}°C，需警惕呼吸道疾病、冻伤"
+                'type': cond_type,
+                'severity': severity,
+                'description': template.format(v=aqi),
             })
-        
-        # 温差大（处理 None 值，避免 TypeError）
+
+        return {
+            'is_extreme': len(extreme_conditions) > 0,
+            'conditions': extreme_conditions
+        }
+
+    def _usable_temp_diff(self, weather_data):
+        """计算参与极端判定的日温差，来源不可信时返回 None。"""
+        # 处理 None 值，避免 TypeError
         temp_max = self._safe_float(weather_data.get('temperature_max'))
         temp_min = self._safe_float(weather_data.get('temperature_min'))
+        if temp_max is None or temp_min is None:
+            return None
+
         temp_range_source = str(weather_data.get('temperature_range_source') or '').strip().lower()
         temp_range_confidence = str(weather_data.get('temperature_range_confidence') or '').strip().lower()
-        if temp_max is not None and temp_min is not None:
-            temp_diff = temp_max - temp_min
-        else:
-            temp_diff = None
-
         # 明确标记 unavailable/heuristic 的来源不参与高风险温差规则
-        range_usable = True
         if temp_range_source in {'unavailable', 'heuristic'}:
-            range_usable = False
+            return None
         # 小时样本过少时，保守地不触发“温差过大”强规则
         if temp_range_source == 'hourly' and temp_range_confidence == 'none':
-            range_usable = False
-
-        if temp_diff is not None and temp_diff > 15 and range_usable:
-            extreme_conditions.append({
-                'type': '温差过大',
-                'severity': '中',
-                'description': f"日温差达{temp_diff}°C，易引发感冒、关节炎复发"
-            })
-        
-        # 高湿度
-        if humidity > 85:
-            extreme_conditions.append({
-                'type': '高湿度',
-                'severity': '中',
-                'description': f"湿度{humidity}%，不利于呼吸道疾病患者"
-            })
-        
-        # 强风
-        if wind_speed > 10:
-            extreme_conditions.append({
-                'type': '强风',
-                'severity': '中',
-                'description': f"风速{wind_speed}m/s，老年人应减少外出"
-            })
-        
-        # 空气污染
-        aqi = self._safe_float(weather_data.get('aqi'), 0.0)
-        if aqi > 200:
-            extreme_conditions.append({
-                'type': '重度空气污染',
-                'severity': '高',
-                'description': f"AQI达{aqi}，严重影响呼吸系统，建议佩戴口罩"
-            })
-        elif aqi > 150:
-            extreme_conditions.append({
-                'type': '中度空气污染',
-                'severity': '中',
-                'description': f"AQI达{aqi}，敏感人群应减少户外活动"
-            })
-        elif aqi > 100:
-            extreme_conditions.append({
-                'type': '轻度空气污染',
-                'severity': '低',
-                'description': f"AQI达{aqi}，建议减少长时间户外活动"
-            })
-        
-        return {
-            'is_extreme': len(extreme_conditions) > 0,
-            'conditions': extreme_conditions
-        }
+            return None
+        return temp_max - temp_min
     
     def analyze_weather_disease_correlation(self, weather_conditions, disease_records):
         """
         分析天气与疾病的相关性
         基于历史数据进行统计分析
         """
-        correlations = {}
-        
-        # 呼吸道疾病与天气关系
-        correlations['呼吸道疾病'] = {
-            '低温': 0.75,  # 相关系数
-            '高湿度': 0.65,
-            '空气污染': 0.85,
-            '温差大': 0.70
-        }
-        
-        # 心血管疾病与天气关系
-        correlations['心血管疾病'] = {
-            '高温': 0.72,
-            '低温': 0.68,
-            '气压变化': 0.60,
-            '温差大': 0.65
-        }
-        
-        # 关节炎与天气关系
-        correlations['关节炎'] = {
-            '高湿度': 0.78,
-            '低温': 0.70,
-            '气压低': 0.62
-        }
-        
-        # 消化系统疾病与天气关系
-        correlations['消化系统疾病'] = {
-            '高温': 0.55,
-            '湿度变化': 0.45
-        }
-        
-        return correlations
+        return _WEATHER_DISEASE_CORRELATIONS
     
     def generate_weather_alert(self, location, weather_data):
         """
@@ -1373,31 +1608,13 @@ class WeatherService:
     
     def _generate_recommendations(self, conditions):
         """根据极端天气条件生成健康建议"""
-        recommendations = []
-        
-        condition_types = [c['type'] for c in conditions]
-        
-        if '高温' in condition_types:
-            recommendations.append('避免在高温时段外出，及时补充水分')
-            recommendations.append('老年人和慢性病患者应待在阴凉处')
-        
-        if '低温' in condition_types:
-            recommendations.append('注意保暖，特别是头部和四肢')
-            recommendations.append('心血管疾病患者应避免剧烈运动')
-        
-        if '温差过大' in condition_types:
-            recommendations.append('早晚注意增减衣物')
-            recommendations.append('关节炎患者应注意关节保暖')
-        
-        if '重度空气污染' in condition_types or '中度空气污染' in condition_types:
-            recommendations.append('减少户外活动，外出佩戴口罩')
-            recommendations.append('呼吸道疾病患者应关闭门窗，使用空气净化器')
-        
-        if '高湿度' in condition_types:
-            recommendations.append('注意室内通风除湿')
-            recommendations.append('呼吸道疾病患者应谨慎外出')
-        
-        return recommendations
+        condition_types = {c['type'] for c in conditions}
+        # 按映射声明顺序输出，AQI 分级互斥保证污染建议不会重复
+        return list(chain.from_iterable(
+            recommendations
+            for cond_type, recommendations in _RECOMMENDATION_MAP.items()
+            if cond_type in condition_types
+        ))
     
     def calculate_risk_index(self, weather_data, user_health_profile):
         """
@@ -1444,4 +1661,61 @@ class WeatherService:
             'risk_level': risk_level
         }
 
+    def calculate_risk_index_batch(self, weather_data, profiles_df):
+        """
+        批量计算个人天气健康风险指数（每日预警任务场景）
+        与 calculate_risk_index 同一套规则，但对同一份天气快照
+        用 NumPy 向量化一次性评估整个 DataFrame，避免逐用户 Python 循环。
+
+        profiles_df 需包含 age、has_chronic_disease、chronic_diseases 列
+        （缺失列按无风险处理），返回带 risk_score、risk_level 列的 DataFrame。
+        """
+        n = len(profiles_df)
+        extreme_result = self.identify_extreme_weather(weather_data)
+        base_score = len(extreme_result['conditions']) * 20 if extreme_result['is_extreme'] else 0
+        score = np.full(n, float(base_score))
+
+        if 'age' in profiles_df.columns:
+            ages = pd.to_numeric(profiles_df['age'], errors='coerce').fillna(0).to_numpy()
+            score += np.where(ages > 65, 15.0, 0.0)  # 老年人风险增加
+
+        if 'has_chronic_disease' in profiles_df.columns:
+            has_chronic = profiles_df['has_chronic_disease'].fillna(False).astype(bool).to_numpy()
+            score += np.where(has_chronic, 25.0, 0.0)  # 慢性病患者风险增加
+
+        # 特定疾病与天气的关联：天气阈值是标量，只需逐行统计关键词命中数。
+        # 与标量版保持一致：同一关键词命中多个疾病时加成按疾病数累加
+        # （如 类风湿关节炎 + 骨关节炎 计两次'关节'加成）
+        if 'chronic_diseases' in profiles_df.columns:
+            disease_lists = profiles_df['chronic_diseases'].apply(
+                lambda ds: ds if isinstance(ds, (list, tuple)) else []
+            )
+            aqi = self._safe_float(weather_data.get('aqi'), 0.0)
+            temperature = self._safe_float(weather_data.get('temperature'), 20.0)
+            humidity = self._safe_float(weather_data.get('humidity'), 0.0)
+
+            def _keyword_hits(keyword):
+                return disease_lists.apply(
+                    lambda ds: sum(keyword in d for d in ds)
+                ).to_numpy(dtype=float)
+
+            if aqi > 100:
+                score += _keyword_hits('呼吸') * 20.0
+            if abs(temperature - 20) > 10:
+                score += _keyword_hits('心血管') * 20.0
+            if humidity > 80:
+                score += _keyword_hits('关节') * 15.0
+
+        # 标准化到0-100并分级
+        score = np.minimum(score, 100.0).astype(int)
+        levels = np.select(
+            [score < 30, score < 60],
+            ['低风险', '中风险'],
+            default='高风险',
+        )
+        return pd.DataFrame(
+            {'risk_score': score, 'risk_level': levels},
+            index=profiles_df.index,
+        )
+
   
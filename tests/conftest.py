@@ -12,12 +12,29 @@ import pytest
 from pathlib import Path
 
 
+def pytest_sessionstart(session):
+    """会话（xdist 下每个 worker）启动时预热重型服务单例。
+
+    DLNM/预报/慢病服务构造时要解析 CSV 与模型档案，集中在启动阶段做一次，
+    首个用到它们的用例不再承担这笔开销；模块级档案缓存也随之填好。
+    社区服务不在此预热：其离线兜底档案依赖构造时是否处于 app 上下文。
+    """
+    from services.dlnm_risk_service import get_dlnm_service
+    from services.forecast_service import get_forecast_service
+    from services.chronic_risk_service import get_chronic_service
+
+    get_dlnm_service()
+    get_forecast_service()
+    get_chronic_service()
+
+
 @pytest.fixture(scope='session', autouse=True)
 def setup_test_environment():
     """自动设置测试环境变量（在所有测试之前执行）。"""
-    # 创建临时数据库文件
+    # 创建临时数据库文件（pytest-xdist 下每个 worker 各自独立，互不碰撞）
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER', 'main')
     temp_db = tempfile.NamedTemporaryFile(
-        prefix='test_health_weather_',
+        prefix=f'test_health_weather_{worker_id}_',
         suffix='.db',
         delete=False
     )
@@ -55,6 +72,38 @@ def setup_test_environment():
         pass
 
 
+@pytest.fixture(scope='session')
+def dlnm_service():
+    """DLNM 风险服务单例（构造需加载模型，整个会话复用）。"""
+    from services.dlnm_risk_service import get_dlnm_service
+
+    return get_dlnm_service()
+
+
+@pytest.fixture(scope='session')
+def forecast_service():
+    """预报服务单例（构造需加载历史数据，整个会话复用）。"""
+    from services.forecast_service import get_forecast_service
+
+    return get_forecast_service()
+
+
+@pytest.fixture(scope='session')
+def community_service():
+    """社区风险服务单例（整个会话复用，仅限只读用例）。"""
+    from services.community_risk_service import get_community_service
+
+    return get_community_service()
+
+
+@pytest.fixture(scope='session')
+def chronic_service():
+    """慢病风险服务单例（构造需加载规则库，整个会话复用）。"""
+    from services.chronic_risk_service import get_chronic_service
+
+    return get_chronic_service()
+
+
 @pytest.fixture(scope='function')
 def app():
     """
@@ -68,6 +117,19 @@ def app():
     app = create_app()
     app.config['TESTING'] = True
 
+    # 测试库不需要崩溃安全：关掉 fsync、日志入内存，砍掉每次 commit 的磁盘开销
+    from sqlalchemy import event
+    from core.extensions import db
+
+    with app.app_context():
+        if db.engine.url.drivername.startswith('sqlite'):
+            @event.listens_for(db.engine, 'connect')
+            def _set_sqlite_test_pragmas(dbapi_connection, _connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute('PRAGMA synchronous=OFF')
+                cursor.execute('PRAGMA journal_mode=MEMORY')
+                cursor.close()
+
     # 确保使用内存存储（避免速率限制干扰测试）
     app.config['RATE_LIMIT_STORAGE_URI'] = 'memory://'
     app.config['RATELIMIT_STORAGE_URI'] = 'memory://'
@@ -87,11 +149,18 @@ def client(app):
     return app.test_client()
 
 
+# 记录已建过表的库文件，整个会话只执行一次 DDL
+_schema_created_urls = set()
+
+
 @pytest.fixture(scope='function')
 def db_session(app):
     """
     提供数据库会话（每个测试后自动回滚）
 
+    表结构整个会话只建一次；每个测试包在一个外层事务里，
+    测试内的 commit 只落到 SAVEPOINT，teardown 统一回滚。
+
     用法:
         def test_example(db_session):
             user = User(username='test')
@@ -101,14 +170,25 @@ def db_session(app):
     from core.extensions import db
 
     with app.app_context():
-        # 创建所有表
-        db.create_all()
+        engine = db.engines[None]
+        engine_url = str(engine.url)
+        if engine_url not in _schema_created_urls:
+            db.create_all()
+            _schema_created_urls.add(engine_url)
+
+        # Flask-SQLAlchemy 官方测试写法：用开着外层事务的连接顶替 engine，
+        # 测试内的 commit 走 SAVEPOINT，不会真正落盘
+        connection = engine.connect()
+        outer_transaction = connection.begin()
+        db.engines[None] = connection
 
         yield db.session
 
         # 测试结束后清理
         db.session.remove()
-        db.drop_all()
+        db.engines[None] = engine
+        outer_transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope='function')
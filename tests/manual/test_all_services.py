@@ -1,180 +1,229 @@
-# -*- coding: utf-8 -*-
+# -*- coding: utf-8 -*-
 """
 全面测试所有服务模块
 """
+import io
+import logging
+import os
 import sys
-import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT_DIR))
 
 pytestmark = pytest.mark.manual
-
-def test_dlnm_service():
-    """测试 DLNM 风险服务"""
-    print('\n1. 测试 DLNM 风险服务...')
-    try:
-        from services.dlnm_risk_service import DLNMRiskService
-        dlnm = DLNMRiskService()
-        
-        # 测试RR计算
-        rr, breakdown = dlnm.calculate_rr(25)
-        print(f'   ✅ RR计算正常: 温度25°C的RR={rr:.3f}')
-        
-        # 测试极端天气识别
-        events = dlnm.identify_extreme_weather_events(38)
-        print(f'   ✅ 极端天气识别: {len(events)}个事件')
-        
-        # 测试模型摘要
-        summary = dlnm.get_model_summary()
-        print(f'   ✅ 模型状态: {summary.get("status", "未知")}')
-        if dlnm.mmt:
-            print(f'   MMT: {dlnm.mmt:.1f}°C')
-        
+
+# 模块级预构造的预报温度数组，免去每次调用重建列表
+_FORECAST_TEMPS = np.array([20, 22, 25, 23, 21, 19, 18], dtype=np.float32)
+
+# 统一用 logger 输出：%s 占位符惰性求值，异常分支由 log.exception 自带堆栈
+log = logging.getLogger('manual_tests')
+
+def test_dlnm_service():
+    """测试 DLNM 风险服务"""
+    log.info('\n1. 测试 DLNM 风险服务...')
+    try:
+        from services.dlnm_risk_service import get_dlnm_service
+        dlnm = get_dlnm_service()
+
+        # 测试RR计算
+        rr, breakdown = dlnm.calculate_rr(25)
+        log.info('   ✅ RR计算正常: 温度25°C的RR=%.3f', rr)
+
+        # 测试极端天气识别
+        events = dlnm.identify_extreme_weather_events(38)
+        log.info('   ✅ 极端天气识别: %d个事件', len(events))
+
+        # 测试模型摘要
+        summary = dlnm.get_model_summary()
+        log.info('   ✅ 模型状态: %s', summary.get('status', '未知'))
+        if dlnm.mmt:
+            log.info('   MMT: %.1f°C', dlnm.mmt)
+
         return
-    except Exception as e:
-        print(f'   ❌ 错误: {e}')
-        traceback.print_exc()
+    except Exception as e:
+        log.exception('   ❌ 错误: %s', e)
         pytest.fail(f"DLNM风险服务测试失败: {e}")
-
-def test_forecast_service():
-    """测试预报服务"""
-    print('\n2. 测试预报服务...')
-    try:
-        from services.forecast_service import ForecastService
-        fs = ForecastService()
-        
-        status = fs.get_service_status()
-        print(f'   ✅ 服务状态正常: 历史数据{status["weather_history_days"]}天')
-        
-        # 测试7天预测
-        forecast_temps = [20, 22, 25, 23, 21, 19, 18]
-        forecasts, summary = fs.generate_7day_forecast(forecast_temps)
-        print(f'   ✅ 7天预测成功: 高风险天数={summary["high_risk_days"]}')
-        print(f'   预计总门诊: {summary["total_expected_visits"]:.0f}人次')
-        
+
+def test_forecast_service():
+    """测试预报服务"""
+    log.info('\n2. 测试预报服务...')
+    try:
+        from services.forecast_service import get_forecast_service
+        fs = get_forecast_service()
+
+        status = fs.get_service_status()
+        log.info('   ✅ 服务状态正常: 历史数据%s天', status["weather_history_days"])
+
+        # 测试7天预测
+        forecasts, summary = fs.generate_7day_forecast(_FORECAST_TEMPS)
+        log.info('   ✅ 7天预测成功: 高风险天数=%s', summary["high_risk_days"])
+        log.info('   预计总门诊: %.0f人次', summary["total_expected_visits"])
+
         return
-    except Exception as e:
-        print(f'   ❌ 错误: {e}')
-        traceback.print_exc()
+    except Exception as e:
+        log.exception('   ❌ 错误: %s', e)
         pytest.fail(f"预报服务测试失败: {e}")
-
-def test_community_service():
-    """测试社区风险服务"""
-    print('\n3. 测试社区风险服务...')
-    try:
-        from services.community_risk_service import CommunityRiskService
-        cs = CommunityRiskService()
-        
-        communities = cs.get_all_communities()
-        print(f'   ✅ 加载社区: {len(communities)}个')
-        
-        # 测试脆弱性计算
-        vi = cs.calculate_vulnerability_index({
-            'elderly_ratio': 0.5,
-            'chronic_disease_ratio': 0.2,
-            'green_space_ratio': 0.1
-        })
-        print(f'   ✅ 脆弱性指数: VI={vi["vulnerability_index"]:.2f} ({vi["level"]})')
-        
-        # 测试风险地图生成
-        result = cs.generate_community_risk_map({'temperature': 30})
-        print(f'   ✅ 风险地图生成: {len(result.get("rankings", []))}个社区排名')
-        
+
+def test_community_service():
+    """测试社区风险服务"""
+    log.info('\n3. 测试社区风险服务...')
+    try:
+        from services.community_risk_service import get_community_service
+        cs = get_community_service()
+
+        communities = cs.get_all_communities()
+        log.info('   ✅ 加载社区: %d个', len(communities))
+
+        # 测试脆弱性计算
+        vi = cs.calculate_vulnerability_index({
+            'elderly_ratio': 0.5,
+            'chronic_disease_ratio': 0.2,
+            'green_space_ratio': 0.1
+        })
+        log.info('   ✅ 脆弱性指数: VI=%.2f (%s)', vi["vulnerability_index"], vi["level"])
+
+        # 测试风险地图生成
+        result = cs.generate_community_risk_map({'temperature': 30})
+        log.info('   ✅ 风险地图生成: %d个社区排名', len(result.get("rankings", [])))
+
         return
-    except Exception as e:
-        print(f'   ❌ 错误: {e}')
-        traceback.print_exc()
+    except Exception as e:
+        log.exception('   ❌ 错误: %s', e)
         pytest.fail(f"社区风险服务测试失败: {e}")
-
-def test_chronic_service():
-    """测试慢病风险服务"""
-    print('\n4. 测试慢病风险服务...')
-    try:
-        from services.chronic_risk_service import ChronicRiskService
-        cr = ChronicRiskService()
-        
-        # 测试个体风险预测
-        result = cr.predict_individual_risk(
-            {'age': 70, 'chronic_diseases': ['高血压', '冠心病']},
-            {'temperature': 35, 'aqi': 100}
-        )
-        print(f'   ✅ 个体风险预测: 等级={result["overall_risk"]["level"]}')
-        print(f'   RR={result["overall_risk"]["rr"]:.2f}')
-        print(f'   建议数: {len(result["recommendations"])}')
-        
-        # 测试人群风险预测
-        pop_result = cr.predict_population_risk({}, {'temperature': 35})
-        print(f'   ✅ 人群风险预测: 最高风险群体={pop_result["overall_summary"]["highest_risk_group"]}')
-        
+
+def test_chronic_service():
+    """测试慢病风险服务"""
+    log.info('\n4. 测试慢病风险服务...')
+    try:
+        from services.chronic_risk_service import get_chronic_service
+        cr = get_chronic_service()
+
+        # 测试个体风险预测
+        result = cr.predict_individual_risk(
+            {'age': 70, 'chronic_diseases': ['高血压', '冠心病']},
+            {'temperature': 35, 'aqi': 100}
+        )
+        log.info('   ✅ 个体风险预测: 等级=%s', result["overall_risk"]["level"])
+        log.info('   RR=%.2f', result["overall_risk"]["rr"])
+        log.info('   建议数: %d', len(result["recommendations"]))
+
+        # 测试人群风险预测
+        pop_result = cr.predict_population_risk({}, {'temperature': 35})
+        log.info('   ✅ 人群风险预测: 最高风险群体=%s', pop_result["overall_summary"]["highest_risk_group"])
+
         return
-    except Exception as e:
-        print(f'   ❌ 错误: {e}')
-        traceback.print_exc()
+    except Exception as e:
+        log.exception('   ❌ 错误: %s', e)
         pytest.fail(f"慢病风险服务测试失败: {e}")
-
-def test_weather_service():
-    """测试天气服务"""
-    print('\n5. 测试天气服务...')
-    try:
-        from services.weather_service import WeatherService
-        ws = WeatherService()
-        
-        # 测试获取天气
-        weather = ws.get_current_weather('北京')
-        print(f'   ✅ 获取天气成功: 温度={weather["temperature"]}°C')
-        
-        # 测试极端天气识别
-        extreme = ws.identify_extreme_weather(weather)
-        print(f'   ✅ 极端天气识别: 是否极端={extreme["is_extreme"]}')
-        
+
+def test_weather_service():
+    """测试天气服务"""
+    log.info('\n5. 测试天气服务...')
+    try:
+        from services.weather_service import WeatherService
+        ws = WeatherService()
+
+        # 测试获取天气
+        weather = ws.get_current_weather('北京')
+        log.info('   ✅ 获取天气成功: 温度=%s°C', weather["temperature"])
+
+        # 测试极端天气识别
+        extreme = ws.identify_extreme_weather(weather)
+        log.info('   ✅ 极端天气识别: 是否极端=%s', extreme["is_extreme"])
+
         return
-    except Exception as e:
-        print(f'   ❌ 错误: {e}')
-        traceback.print_exc()
+    except Exception as e:
+        log.exception('   ❌ 错误: %s', e)
         pytest.fail(f"天气服务测试失败: {e}")
 
 
-def _run_manual_case(test_func):
+class _ThreadBufferedStdout:
+    """线程各自缓冲 stdout，供 __main__ 并行跑用例时保持日志可读。"""
+
+    def __init__(self, real_stdout):
+        self.real_stdout = real_stdout
+        self._local = threading.local()
+
+    def activate(self):
+        """当前线程的输出改写入独立缓冲区，返回该缓冲区。"""
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, text):
+        target = getattr(self._local, 'buffer', None) or self.real_stdout
+        return target.write(text)
+
+    def flush(self):
+        target = getattr(self._local, 'buffer', None) or self.real_stdout
+        target.flush()
+
+
+def _run_manual_case(test_func, output_router):
     """Allow running pytest-style tests from __main__ for manual smoke checks."""
+    buffer = output_router.activate()
     try:
         test_func()
-        return True
+        return True, buffer.getvalue()
     except BaseException:
-        return False
-
-if __name__ == '__main__':
-    print('=' * 60)
-    print('全面测试所有服务模块')
-    print('=' * 60)
-    
-    results = {
-        'DLNM风险服务': _run_manual_case(test_dlnm_service),
-        '预报服务': _run_manual_case(test_forecast_service),
-        '社区风险服务': _run_manual_case(test_community_service),
-        '慢病风险服务': _run_manual_case(test_chronic_service),
-        '天气服务': _run_manual_case(test_weather_service)
+        return False, buffer.getvalue()
+
+if __name__ == '__main__':
+    print('=' * 60)
+    print('全面测试所有服务模块')
+    print('=' * 60)
+
+    tests = {
+        'DLNM风险服务': test_dlnm_service,
+        '预报服务': test_forecast_service,
+        '社区风险服务': test_community_service,
+        '慢病风险服务': test_chronic_service,
+        '天气服务': test_weather_service
     }
-    
-    print('\n' + '=' * 60)
-    print('测试结果汇总')
-    print('=' * 60)
-    
-    passed = 0
-    failed = 0
-    for name, result in results.items():
-        status = '✅ 通过' if result else '❌ 失败'
-        print(f'  {name}: {status}')
-        if result:
-            passed += 1
-        else:
-            failed += 1
-    
-    print(f'\n总计: {passed} 通过, {failed} 失败')
-    
-    if failed > 0:
-        sys.exit(1)
-
+
+    # 各用例相互独立且多为 I/O 等待，用线程池并行跑以缩短整体耗时
+    output_router = _ThreadBufferedStdout(sys.stdout)
+    sys.stdout = output_router
+    logging.basicConfig(
+        level=os.getenv('MANUAL_TEST_LOG_LEVEL', 'INFO'),
+        format='%(message)s',
+        stream=output_router,
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {
+                name: executor.submit(_run_manual_case, func, output_router)
+                for name, func in tests.items()
+            }
+            outcomes = {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = output_router.real_stdout
+
+    results = {}
+    for name, (passed_case, output) in outcomes.items():
+        print(output, end='')
+        results[name] = passed_case
+
+    print('\n' + '=' * 60)
+    print('测试结果汇总')
+    print('=' * 60)
+
+    passed = 0
+    failed = 0
+    for name, result in results.items():
+        status = '✅ 通过' if result else '❌ 失败'
+        print(f'  {name}: {status}')
+        if result:
+            passed += 1
+        else:
+            failed += 1
+
+    print(f'\n总计: {passed} 通过, {failed} 失败')
+
+    if failed > 0:
+        sys.exit(1)
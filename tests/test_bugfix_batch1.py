@@ -9,6 +9,18 @@ import json
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _clean_tables(app):
+    """本文件的用例直接 commit 真实数据，结束后清空各表避免泄漏到其他测试。"""
+    yield
+    from core.extensions import db
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
 # ── helpers ──────────────────────────────────────────────────────────
 
 
@@ -345,7 +357,7 @@ class TestOpenMeteoAqiFlag:
             }
             with patch.object(ws, '_get_location', return_value='120.0,30.0'), \
                  patch.object(ws, '_parse_lon_lat', return_value=('120.0', '30.0')), \
-                 patch('requests.get', return_value=mock_resp):
+                 patch('services.weather_service._http_get', return_value=mock_resp):
                 result = ws._get_openmeteo_weather('测试城市')
 
             assert result is not None
@@ -393,7 +405,7 @@ class TestOpenMeteoAqiFlag:
                 'daily': [{'tempMax': '37', 'tempMin': '19'}]
             }
 
-            with patch('requests.get', side_effect=[mock_resp, mock_daily, mock_air]):
+            with patch('services.weather_service._http_get', side_effect=[mock_resp, mock_daily, mock_air]):
                 result = ws.get_current_weather('测试城市')
 
             assert result is not None
@@ -438,7 +450,7 @@ class TestOpenMeteoAqiFlag:
             }
             with patch.object(ws, '_get_location', return_value='120.0,30.0'), \
                  patch.object(ws, '_parse_lon_lat', return_value=('120.0', '30.0')), \
-                 patch('requests.get', side_effect=[mock_now, mock_hourly]):
+                 patch('services.weather_service._http_get', side_effect=[mock_now, mock_hourly]):
                 result = ws._get_openmeteo_weather('测试城市')
 
             assert result['temperature_max'] == 35.0
@@ -481,7 +493,7 @@ class TestOpenMeteoAqiFlag:
             mock_air.status_code = 200
             mock_air.json.return_value = {'code': '404'}
 
-            with patch('requests.get', side_effect=[mock_now, mock_daily_fail, mock_hourly, mock_air]):
+            with patch('services.weather_service._http_get', side_effect=[mock_now, mock_daily_fail, mock_hourly, mock_air]):
                 result = ws.get_current_weather('测试城市')
 
             assert result['temperature_max'] == 35.0
@@ -514,7 +526,7 @@ class TestOpenMeteoAqiFlag:
             mock_air.status_code = 200
             mock_air.json.return_value = {'code': '404'}
 
-            with patch('requests.get', side_effect=[mock_now, mock_daily_fail, mock_hourly_fail, mock_air]):
+            with patch('services.weather_service._http_get', side_effect=[mock_now, mock_daily_fail, mock_hourly_fail, mock_air]):
                 result = ws.get_current_weather('测试城市')
 
             assert result['temperature_max'] is None
@@ -611,7 +623,7 @@ class TestAuditIpTrustBoundary:
         from core.extensions import db
         from core.db_models import AuditLog
         from core.security import hash_identifier
-        from utils.audit_log import log_security_event
+        from utils.audit_log import flush_audit_queue, log_security_event
 
         with app.app_context():
             app.config['FEATURE_AUDIT_LOGS'] = True
@@ -625,6 +637,8 @@ class TestAuditIpTrustBoundary:
             ):
                 log_security_event('ip_privacy_test')
 
+            # 入库已改为后台批量写，断言前先同步清空队列
+            flush_audit_queue()
             row = AuditLog.query.filter_by(action='ip_privacy_test').first()
             assert row is not None
             assert row.ip_address == hash_identifier('198.51.100.23')
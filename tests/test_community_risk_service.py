@@ -65,11 +65,9 @@ def test_excess_risk_normalization_avoids_hard_saturation():
     assert elevated["normalized_score"] == round(formula["hazard"], 1)
 
 
-def test_baseline_visits_estimation_scales_with_population():
-    service = CommunityRiskService()
-
-    small = service._estimate_baseline_visits(20)
-    large = service._estimate_baseline_visits(200)
+def test_baseline_visits_estimation_scales_with_population(community_service):
+    small = community_service._estimate_baseline_visits(20)
+    large = community_service._estimate_baseline_visits(200)
 
     assert large > small
     assert large == 6.0
@@ -84,6 +82,7 @@ def test_default_community_proxies_are_reproducible_across_instances():
 
 
 def test_default_community_proxies_are_stable_and_distinct():
+    # 必须新建实例：会话级单例可能已在 app 上下文里构造，不含离线兜底档案
     service = CommunityRiskService()
     first = service.community_profiles["牛家垄周村"]
     second = service.community_profiles["岭背徐村"]
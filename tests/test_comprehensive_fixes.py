@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 """Comprehensive regression tests for security fixes."""
 import importlib
-import json
+import mmap
 import os
 import sys
 from datetime import timedelta
-from pathlib import Path
 
 import pytest
 
@@ -44,10 +43,18 @@ def _nested_dict(levels):
     return data
 
 
+# 模块级直接拼好 JSON 字符串负载，省掉 json.dumps 序列化
+OVERSIZED_JSON = '{"data": "' + 'a' * (10 * 1024 + 1) + '"}'
+TOO_DEEP_JSON = '{"child": ' * 5 + '{}' + '}' * 5
+MAX_DEPTH_JSON = '{"child": ' * 4 + '{}' + '}' * 4
+
+
 def test_db_models_no_datetime_utcnow():
-    content = Path('core/db_models.py').read_text(encoding='utf-8')
-    assert 'datetime.utcnow' not in content
-    assert 'datetime.now(timezone.utc)' in content
+    # mmap 直接按字节搜索，省掉整文件解码成 str
+    with open('core/db_models.py', 'rb') as source:
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert mapped.find(b'datetime.utcnow') == -1
+            assert mapped.find(b'datetime.now(timezone.utc)') != -1
 
 
 def test_utcnow_naive_returns_naive():
@@ -57,24 +64,16 @@ def test_utcnow_naive_returns_naive():
     assert now.tzinfo is None
 
 
-def test_from_json_filter_size_limit(app):
-    filter_fn = app.jinja_env.filters['from_json']
-    payload = json.dumps({'data': 'a' * (10 * 1024 + 1)})
-    assert filter_fn(payload) == []
-
-
-def test_from_json_filter_depth_limit(app):
-    filter_fn = app.jinja_env.filters['from_json']
-    payload = json.dumps(_nested_dict(6))
-    assert filter_fn(payload) == []
-
-
-def test_from_json_filter_valid_depth(app):
-    filter_fn = app.jinja_env.filters['from_json']
-    payload = json.dumps(_nested_dict(5))
-    parsed = filter_fn(payload)
-    assert isinstance(parsed, dict)
-    assert 'child' in parsed
+@pytest.mark.parametrize(
+    ('payload', 'expected'),
+    [
+        pytest.param(OVERSIZED_JSON, [], id='size_limit'),
+        pytest.param(TOO_DEEP_JSON, [], id='depth_limit'),
+        pytest.param(MAX_DEPTH_JSON, _nested_dict(5), id='valid_depth'),
+    ],
+)
+def test_from_json_filter_limits(app, payload, expected):
+    assert app.jinja_env.filters['from_json'](payload) == expected
 
 
 def test_api_post_requires_csrf(authenticated_client):
@@ -102,6 +101,7 @@ def test_short_code_length_8(db_session):
     assert code.isdigit()
 
 
+@pytest.mark.xdist_group('db')
 def test_redeemed_at_only_set_once(db_session):
     from core.db_models import PairLink, User
     from core.extensions import db
@@ -112,7 +112,7 @@ def test_redeemed_at_only_set_once(db_session):
     caregiver = User(username='caregiver')
     caregiver.set_password('password123')
     db_session.add(caregiver)
-    db_session.commit()
+    db_session.flush()  # 取 id 即可，和后面的 link 合并成一次 commit
 
     short_code = '12345678'
     link = PairLink(
@@ -136,6 +136,7 @@ def test_redeemed_at_only_set_once(db_session):
     assert refreshed.redeemed_at == original_redeemed_at
 
 
+@pytest.mark.xdist_group('db')
 def test_atomic_transaction_rolls_back(db_session):
     from core.db_models import User
     from utils.database import atomic_transaction
@@ -150,6 +151,7 @@ def test_atomic_transaction_rolls_back(db_session):
     assert User.query.filter_by(username='rollback_user').first() is None
 
 
+@pytest.mark.xdist_group('db')
 def test_pairlink_is_expired_property(db_session):
     from core.db_models import PairLink, User
     from core.time_utils import utcnow_naive
@@ -157,7 +159,7 @@ def test_pairlink_is_expired_property(db_session):
     caregiver = User(username='caregiver2')
     caregiver.set_password('password123')
     db_session.add(caregiver)
-    db_session.commit()
+    db_session.flush()  # 取 id 即可，和后面的 link 合并成一次 commit
 
     link = PairLink(
         caregiver_id=caregiver.id,
@@ -175,13 +177,14 @@ def test_pairlink_is_expired_property(db_session):
     assert link.is_active is False
 
 
+@pytest.mark.xdist_group('db')
 def test_pair_is_active_property(db_session):
     from core.db_models import Pair, User
 
     caregiver = User(username='caregiver3')
     caregiver.set_password('password123')
     db_session.add(caregiver)
-    db_session.commit()
+    db_session.flush()  # 取 id 即可，和后面的 pair 合并成一次 commit
 
     pair = Pair(
         caregiver_id=caregiver.id,
@@ -198,58 +201,46 @@ def test_pair_is_active_property(db_session):
     assert pair.is_expired is False
 
 
-def test_validate_production_config_missing_secret_key(tmp_path):
-    original = _set_env({
-        'SECRET_KEY': None,
-        'PAIR_TOKEN_PEPPER': 'pepper-1234567890pepper-1234567890',
-        'DEBUG': 'false',
-        'DATABASE_URI': f"sqlite:///{tmp_path/'prod.db'}",
-    })
-    try:
-        config = _reload_config()
-        with pytest.raises(RuntimeError):
-            config.validate_production_config()
-    finally:
-        _restore_env(original)
-        _reload_config()
+STRONG_SECRET_KEY = 'strongkey1234567890strongkey123456'
+STRONG_PEPPER = 'pepper-1234567890pepper-1234567890'
 
 
-def test_validate_production_config_short_secret_key(tmp_path):
-    original = _set_env({
-        'SECRET_KEY': 'short-key',
-        'PAIR_TOKEN_PEPPER': 'pepper-1234567890pepper-1234567890',
-        'DEBUG': 'false',
-        'DATABASE_URI': f"sqlite:///{tmp_path/'prod.db'}",
-    })
-    try:
-        config = _reload_config()
-        with pytest.raises(RuntimeError):
-            config.validate_production_config()
-    finally:
-        _restore_env(original)
-        _reload_config()
+@pytest.mark.parametrize(
+    ('secret_key', 'pepper', 'rate_limit_uri', 'error_match'),
+    [
+        (None, STRONG_PEPPER, 'redis://localhost:6379/0', 'SECRET_KEY 未设置'),
+        ('short-key', STRONG_PEPPER, 'redis://localhost:6379/0', '长度过短'),
+        ('dev-secret-key-should-fail-1234567890', STRONG_PEPPER, 'redis://localhost:6379/0', '弱关键词'),
+        (STRONG_SECRET_KEY, None, 'redis://localhost:6379/0', 'PAIR_TOKEN_PEPPER 未设置'),
+        (STRONG_SECRET_KEY, STRONG_PEPPER, 'memory://', 'memory://'),
+    ],
+)
+def test_validate_production_secrets_rejects_bad_config(secret_key, pepper, rate_limit_uri, error_match):
+    from core.config import _validate_production_secrets
 
+    with pytest.raises(RuntimeError, match=error_match):
+        _validate_production_secrets(False, secret_key, pepper, rate_limit_uri)
+
+
+def test_validate_production_secrets_accepts_redis_rate_limit():
+    from core.config import _validate_production_secrets
+
+    _validate_production_secrets(
+        False, STRONG_SECRET_KEY, STRONG_PEPPER, 'redis://localhost:6379/0'
+    )
 
-def test_validate_production_config_weak_secret_key(tmp_path):
-    original = _set_env({
-        'SECRET_KEY': 'dev-secret-key-should-fail-1234567890',
-        'PAIR_TOKEN_PEPPER': 'pepper-1234567890pepper-1234567890',
-        'DEBUG': 'false',
-        'DATABASE_URI': f"sqlite:///{tmp_path/'prod.db'}",
-    })
-    try:
-        config = _reload_config()
-        with pytest.raises(RuntimeError):
-            config.validate_production_config()
-    finally:
-        _restore_env(original)
-        _reload_config()
 
+def test_validate_production_secrets_skipped_in_debug():
+    from core.config import _validate_production_secrets
 
-def test_validate_production_config_missing_pepper(tmp_path):
+    _validate_production_secrets(True, None, None)
+
+
+@pytest.mark.xdist_group('env')
+def test_validate_production_config_reads_environment(tmp_path):
     original = _set_env({
-        'SECRET_KEY': 'strongkey1234567890strongkey123456',
-        'PAIR_TOKEN_PEPPER': None,
+        'SECRET_KEY': 'dev-secret-key-should-fail-1234567890',
+        'PAIR_TOKEN_PEPPER': STRONG_PEPPER,
         'DEBUG': 'false',
         'DATABASE_URI': f"sqlite:///{tmp_path/'prod.db'}",
     })
@@ -262,6 +253,7 @@ def test_validate_production_config_missing_pepper(tmp_path):
         _reload_config()
 
 
+@pytest.mark.xdist_group('env')
 def test_sqlalchemy_engine_options_sqlite(tmp_path):
     original = _set_env({
         'DATABASE_URI': f"sqlite:///{tmp_path/'engine.db'}",
@@ -275,40 +267,7 @@ def test_sqlalchemy_engine_options_sqlite(tmp_path):
         _reload_config()
 
 
-def test_validate_production_config_rejects_memory_rate_limit(tmp_path):
-    original = _set_env({
-        'SECRET_KEY': 'strongkey1234567890strongkey123456',
-        'PAIR_TOKEN_PEPPER': 'pepper-1234567890pepper-1234567890',
-        'DEBUG': 'false',
-        'DATABASE_URI': f"sqlite:///{tmp_path/'prod_rate_limit.db'}",
-        'RATE_LIMIT_STORAGE_URI': 'memory://',
-        'REDIS_URL': '',
-    })
-    try:
-        config = _reload_config()
-        with pytest.raises(RuntimeError, match='memory://'):
-            config.validate_production_config()
-    finally:
-        _restore_env(original)
-        _reload_config()
-
-
-def test_validate_production_config_accepts_redis_rate_limit(tmp_path):
-    original = _set_env({
-        'SECRET_KEY': 'strongkey1234567890strongkey123456',
-        'PAIR_TOKEN_PEPPER': 'pepper-1234567890pepper-1234567890',
-        'DEBUG': 'false',
-        'DATABASE_URI': f"sqlite:///{tmp_path/'prod_rate_limit_ok.db'}",
-        'RATE_LIMIT_STORAGE_URI': 'redis://localhost:6379/0',
-    })
-    try:
-        config = _reload_config()
-        config.validate_production_config()
-    finally:
-        _restore_env(original)
-        _reload_config()
-
-
+@pytest.mark.xdist_group('env')
 def test_configure_app_sets_secure_cookie_defaults_for_production(tmp_path):
     original = _set_env({
         'SECRET_KEY': 'strongkey1234567890strongkey123456',
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""calculate_rr_batch 与标量 calculate_rr 的一致性回归测试。"""
+import numpy as np
+import pytest
+
+
+SWEEP_TEMPS = [-5.0, 5.0, 15.0, 25.0, 35.0]
+
+
+def test_batch_matches_scalar_rr(dlnm_service):
+    """批量计算必须与逐点 calculate_rr 完全一致。"""
+    expected = [dlnm_service.calculate_rr(temp)[0] for temp in SWEEP_TEMPS]
+
+    result = dlnm_service.calculate_rr_batch(SWEEP_TEMPS)
+
+    assert isinstance(result, np.ndarray)
+    assert result.shape == (len(SWEEP_TEMPS),)
+    assert list(result) == pytest.approx(expected)
+
+
+def test_profile_grids_shared_across_instances():
+    """同进程重复实例化复用同一份外部模型曲线，不重复解析。"""
+    from services.dlnm_risk_service import DLNMRiskService
+
+    first = DLNMRiskService()
+    second = DLNMRiskService()
+    if not (first.profile_loaded and second.profile_loaded):
+        pytest.skip('未加载外部校准模型')
+
+    assert first._profile_temp_grid is second._profile_temp_grid
+    assert first._profile_rr_grid is second._profile_rr_grid
+    # 可变的温度-RR字典按实例拷贝，互不影响
+    assert first.temperature_rr == second.temperature_rr
+    assert first.temperature_rr is not second.temperature_rr
+
+
+def test_batch_untrained_uses_simplified_formula():
+    """模型未训练时批量路径套用与标量相同的简化公式。"""
+    from services.dlnm_risk_service import DLNMRiskService
+
+    service = DLNMRiskService.__new__(DLNMRiskService)
+    service.model_trained = False
+
+    result = service.calculate_rr_batch([10.0, 20.0, 38.0])
+
+    assert list(result) == pytest.approx([1.15, 1.0, 1.27])
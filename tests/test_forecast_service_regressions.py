@@ -4,14 +4,24 @@
 import math
 from datetime import date
 
+import numpy as np
 import pytest
 
 
-def test_normalize_forecast_entry_preserves_zero_p50():
-    from services.forecast_service import ForecastService
+def test_generate_7day_forecast_accepts_ndarray(forecast_service):
+    temps = [20.0, 22.0, 25.0, 23.0, 21.0, 19.0, 18.0]
+
+    list_forecasts, list_summary = forecast_service.generate_7day_forecast(temps)
+    array_forecasts, array_summary = forecast_service.generate_7day_forecast(
+        np.array(temps, dtype=np.float32)
+    )
+
+    assert array_summary['total_expected_visits'] == list_summary['total_expected_visits']
+    assert [f['risk_level'] for f in array_forecasts] == [f['risk_level'] for f in list_forecasts]
+
 
-    service = ForecastService()
-    normalized = service._normalize_forecast_entry({
+def test_normalize_forecast_entry_preserves_zero_p50(forecast_service):
+    normalized = forecast_service._normalize_forecast_entry({
         'temperature_ensemble_p50': 0,
         'temperature_ensemble_mean': 5,
         'temperature': 8,
@@ -1,24 +1,33 @@
 # -*- coding: utf-8 -*-
 import json
+from types import MappingProxyType
+
+import pytest
+
+# 模块级只读负载：每次调用只拷贝，不重建 11 项字典字面量
+_WEATHER_PAYLOAD = MappingProxyType({
+    'temperature': 30,
+    'temperature_max': 33,
+    'temperature_min': 25,
+    'humidity': 60,
+    'pressure': 1008,
+    'weather_condition': '晴',
+    'wind_speed': 1.8,
+    'pm25': 20,
+    'aqi': 40,
+    'is_mock': True,
+    'data_source': 'Mock'
+})
 
 
 def _dummy_weather_payload():
-    return {
-        'temperature': 30,
-        'temperature_max': 33,
-        'temperature_min': 25,
-        'humidity': 60,
-        'pressure': 1008,
-        'weather_condition': '晴',
-        'wind_speed': 1.8,
-        'pm25': 20,
-        'aqi': 40,
-        'is_mock': True,
-        'data_source': 'Mock'
-    }
+    # 拷贝返回：缓存层会往负载里补字段
+    return dict(_WEATHER_PAYLOAD)
 
 
 class DummyWeatherFetcher:
+    __slots__ = ('calls', 'forecast_calls', 'qweather_forecast_calls')
+
     def __init__(self):
         self.calls = 0
         self.forecast_calls = 0
@@ -86,6 +95,8 @@ class DummyWeatherFetcher:
 
 
 class FakeRedis:
+    __slots__ = ('store',)
+
     def __init__(self):
         self.store = {}
 
@@ -96,52 +107,57 @@ class FakeRedis:
         self.store[key] = value
 
 
+@pytest.fixture(autouse=True)
+def _app_ctx(app):
+    """统一在夹具里推入 app 上下文，免去每个测试体内的 with app.app_context()。"""
+    with app.app_context():
+        yield
+
+
 def test_weather_cache_db_roundtrip(app, db_session):
     from core.weather import get_weather_with_cache, register_weather_fetcher
 
-    with app.app_context():
-        app.config['DEMO_MODE'] = False
-        app.extensions['redis_client'] = None
+    app.config['DEMO_MODE'] = False
+    app.extensions['redis_client'] = None
 
-        fetcher = DummyWeatherFetcher()
-        register_weather_fetcher(fetcher)
+    fetcher = DummyWeatherFetcher()
+    register_weather_fetcher(fetcher)
 
-        data_1, from_cache_1 = get_weather_with_cache('北京')
-        data_2, from_cache_2 = get_weather_with_cache('北京')
+    data_1, from_cache_1 = get_weather_with_cache('北京')
+    data_2, from_cache_2 = get_weather_with_cache('北京')
 
-        assert data_1
-        assert data_2
-        assert fetcher.calls == 1
-        assert from_cache_1 is False
-        assert from_cache_2 is True
+    assert data_1
+    assert data_2
+    assert fetcher.calls == 1
+    assert from_cache_1 is False
+    assert from_cache_2 is True
 
 
 def test_forecast_cache_prefers_redis(app, db_session):
     from core.weather import get_forecast_with_cache, register_weather_fetcher
 
-    with app.app_context():
-        app.config['DEMO_MODE'] = False
-        fake_redis = FakeRedis()
-        app.extensions['redis_client'] = fake_redis
+    app.config['DEMO_MODE'] = False
+    fake_redis = FakeRedis()
+    app.extensions['redis_client'] = fake_redis
 
-        cached_forecast = [{
-            'forecast_date': 'cached',
-            'temperature_max': 28,
-            'temperature_min': 18,
-            'is_mock': True
-        }]
-        # 产品只使用都昌县天气；旧城市参数也必须命中同一份县级缓存。
-        redis_key = 'weather:forecast:都昌县:3'
-        fake_redis.setex(redis_key, 600, json.dumps(cached_forecast, ensure_ascii=False))
+    cached_forecast = [{
+        'forecast_date': 'cached',
+        'temperature_max': 28,
+        'temperature_min': 18,
+        'is_mock': True
+    }]
+    # 产品只使用都昌县天气；旧城市参数也必须命中同一份县级缓存。
+    redis_key = 'weather:forecast:都昌县:3'
+    fake_redis.setex(redis_key, 600, json.dumps(cached_forecast, ensure_ascii=False))
 
-        fetcher = DummyWeatherFetcher()
-        register_weather_fetcher(fetcher)
+    fetcher = DummyWeatherFetcher()
+    register_weather_fetcher(fetcher)
 
-        data, from_cache = get_forecast_with_cache('北京', days=3)
+    data, from_cache = get_forecast_with_cache('北京', days=3)
 
-        assert from_cache is True
-        assert data == cached_forecast
-        assert fetcher.forecast_calls == 0
+    assert from_cache is True
+    assert data == cached_forecast
+    assert fetcher.forecast_calls == 0
 
 
 def test_qweather_only_forecast_ignores_legacy_mock_cache(app, db_session):
@@ -150,33 +166,32 @@ def test_qweather_only_forecast_ignores_legacy_mock_cache(app, db_session):
     from core.time_utils import utcnow
     from core.weather import get_qweather_forecast_with_cache, register_weather_fetcher
 
-    with app.app_context():
-        app.config['DEMO_MODE'] = False
-        app.extensions['redis_client'] = None
-        db.session.add(ForecastCache(
-            location='都昌',
-            days=7,
-            fetched_at=utcnow(),
-            payload=json.dumps([{
-                'date': 'legacy',
-                'temperature_max': 34,
-                'temperature_min': 26,
-                'is_mock': True,
-                'data_source': 'Mock',
-            }], ensure_ascii=False),
-            is_mock=True,
-        ))
-        db.session.commit()
-
-        fetcher = DummyWeatherFetcher()
-        register_weather_fetcher(fetcher)
-
-        data, from_cache, meta = get_qweather_forecast_with_cache('都昌', days=7)
-
-        assert from_cache is False
-        assert fetcher.qweather_forecast_calls == 1
-        assert data[0]['data_source'] == 'QWeather'
-        assert meta['source'] == 'QWeather'
+    app.config['DEMO_MODE'] = False
+    app.extensions['redis_client'] = None
+    db.session.add(ForecastCache(
+        location='都昌',
+        days=7,
+        fetched_at=utcnow(),
+        payload=json.dumps([{
+            'date': 'legacy',
+            'temperature_max': 34,
+            'temperature_min': 26,
+            'is_mock': True,
+            'data_source': 'Mock',
+        }], ensure_ascii=False),
+        is_mock=True,
+    ))
+    db.session.commit()
+
+    fetcher = DummyWeatherFetcher()
+    register_weather_fetcher(fetcher)
+
+    data, from_cache, meta = get_qweather_forecast_with_cache('都昌', days=7)
+
+    assert from_cache is False
+    assert fetcher.qweather_forecast_calls == 1
+    assert data[0]['data_source'] == 'QWeather'
+    assert meta['source'] == 'QWeather'
 
 
 def test_qweather_only_forecast_ignores_stale_date_cache(app, db_session):
@@ -187,38 +202,37 @@ def test_qweather_only_forecast_ignores_stale_date_cache(app, db_session):
     from core.time_utils import today_local, utcnow
     from core.weather import get_qweather_forecast_with_cache, register_weather_fetcher
 
-    with app.app_context():
-        app.config['DEMO_MODE'] = False
-        app.extensions['redis_client'] = None
-        stale_start = today_local() - timedelta(days=1)
-        stale_daily = [
-            {
-                'date': (stale_start + timedelta(days=idx)).strftime('%Y-%m-%d'),
-                'temperature_max': 31,
-                'temperature_min': 24,
-                'data_source': 'QWeather',
-                'is_mock': False,
-            }
-            for idx in range(7)
-        ]
-        db.session.add(ForecastCache(
-            location='qweather-only:都昌',
-            days=7,
-            fetched_at=utcnow(),
-            payload=json.dumps({'daily': stale_daily, 'meta': {'source': 'QWeather'}}, ensure_ascii=False),
-            is_mock=False,
-        ))
-        db.session.commit()
+    app.config['DEMO_MODE'] = False
+    app.extensions['redis_client'] = None
+    stale_start = today_local() - timedelta(days=1)
+    stale_daily = [
+        {
+            'date': (stale_start + timedelta(days=idx)).strftime('%Y-%m-%d'),
+            'temperature_max': 31,
+            'temperature_min': 24,
+            'data_source': 'QWeather',
+            'is_mock': False,
+        }
+        for idx in range(7)
+    ]
+    db.session.add(ForecastCache(
+        location='qweather-only:都昌',
+        days=7,
+        fetched_at=utcnow(),
+        payload=json.dumps({'daily': stale_daily, 'meta': {'source': 'QWeather'}}, ensure_ascii=False),
+        is_mock=False,
+    ))
+    db.session.commit()
 
-        fetcher = DummyWeatherFetcher()
-        register_weather_fetcher(fetcher)
+    fetcher = DummyWeatherFetcher()
+    register_weather_fetcher(fetcher)
 
-        data, from_cache, meta = get_qweather_forecast_with_cache('都昌', days=7)
+    data, from_cache, meta = get_qweather_forecast_with_cache('都昌', days=7)
 
-        assert from_cache is False
-        assert fetcher.qweather_forecast_calls == 1
-        assert data[0]['date'] == today_local().strftime('%Y-%m-%d')
-        assert meta['source'] == 'QWeather'
+    assert from_cache is False
+    assert fetcher.qweather_forecast_calls == 1
+    assert data[0]['date'] == today_local().strftime('%Y-%m-%d')
+    assert meta['source'] == 'QWeather'
 
 
 def test_short_code_action_resolve_pair(app, db_session):
@@ -227,36 +241,35 @@ def test_short_code_action_resolve_pair(app, db_session):
     from core.extensions import db
     from core.security import hash_pair_token, hash_short_code
 
-    with app.app_context():
-        app.config['PAIR_TOKEN_PEPPER'] = 'test-pepper'
-
-        caregiver = User(username='caregiver')
-        caregiver.set_password('password123')
-        db_session.add(caregiver)
-        db_session.commit()
-
-        short_code = '12345678'
-        token = 'token-123'
-        link = PairLink(
-            caregiver_id=caregiver.id,
-            short_code=short_code,
-            short_code_hash=hash_short_code(short_code),
-            token_hash=hash_pair_token(token),
-            community_code='test',
-            status='active'
-        )
-        db_session.add(link)
-        db_session.commit()
-
-        with app.test_request_context('/'):
-            pair, error = public_service._resolve_pair(short_code, token)
-        assert error is None
-        assert pair is not None
-        assert pair.short_code == short_code
-
-        refreshed = db.session.get(PairLink, link.id)
-        assert refreshed.status == 'redeemed'
-        assert refreshed.redeemed_at is not None
+    app.config['PAIR_TOKEN_PEPPER'] = 'test-pepper'
+
+    caregiver = User(username='caregiver')
+    caregiver.set_password('password123')
+    db_session.add(caregiver)
+    db_session.commit()
+
+    short_code = '12345678'
+    token = 'token-123'
+    link = PairLink(
+        caregiver_id=caregiver.id,
+        short_code=short_code,
+        short_code_hash=hash_short_code(short_code),
+        token_hash=hash_pair_token(token),
+        community_code='test',
+        status='active'
+    )
+    db_session.add(link)
+    db_session.commit()
+
+    with app.test_request_context('/'):
+        pair, error = public_service._resolve_pair(short_code, token)
+    assert error is None
+    assert pair is not None
+    assert pair.short_code == short_code
+
+    refreshed = db.session.get(PairLink, link.id)
+    assert refreshed.status == 'redeemed'
+    assert refreshed.redeemed_at is not None
 
 
 def test_api_current_weather_structure(client):
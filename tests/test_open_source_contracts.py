@@ -37,7 +37,7 @@ def test_openmeteo_current_weather_contract_marks_source_and_uncertainty(app, mo
                 },
             })
 
-        monkeypatch.setattr(weather_module.requests, 'get', fake_get)
+        monkeypatch.setattr(weather_module, '_http_get', fake_get)
 
         result = service._get_openmeteo_weather('都昌')
 
@@ -75,7 +75,7 @@ def test_openmeteo_daily_forecast_contract_uses_no_sdk_or_live_network(app, monk
                 },
             })
 
-        monkeypatch.setattr(weather_module.requests, 'get', fake_get)
+        monkeypatch.setattr(weather_module, '_http_get', fake_get)
 
         result = service._get_openmeteo_forecast('都昌', days=2)
 
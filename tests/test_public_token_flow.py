@@ -3,12 +3,25 @@
 
 from datetime import timedelta
 
+import pytest
+
 from core.db_models import CommunityDaily, DailyStatus, Pair, PairActionToken, PairLink, User
 from core.security import hash_pair_token, hash_short_code
 from core.time_utils import today_local, utcnow
 from core.extensions import db
 
 
+@pytest.fixture(autouse=True)
+def _clean_tables(app):
+    """本文件的用例直接 commit 真实数据，结束后清空各表避免泄漏到其他测试。"""
+    yield
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
 def _login(client, username, password):
     with client.session_transaction() as sess:
         sess["_csrf_token"] = "test-csrf-token"
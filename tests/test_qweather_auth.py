@@ -173,8 +173,8 @@ def test_auth_failure_does_not_use_budget_or_network(monkeypatch, tmp_path):
         lambda endpoint: budget_calls.append(endpoint) or True,
     )
     monkeypatch.setattr(
-        weather_module.requests,
-        "get",
+        weather_module,
+        "_http_get",
         lambda *_args, **_kwargs: pytest.fail("认证失败后不应发送网络请求"),
     )
     monkeypatch.setattr(service, "_get_fallback_weather", lambda *_args: fallback)
@@ -217,8 +217,8 @@ def test_each_weather_path_authenticates_before_budget(
         lambda endpoint: budget_calls.append(endpoint) or True,
     )
     monkeypatch.setattr(
-        weather_module.requests,
-        "get",
+        weather_module,
+        "_http_get",
         lambda *_args, **_kwargs: pytest.fail("认证失败后不应发送网络请求"),
     )
 
@@ -263,7 +263,7 @@ def test_weather_service_uses_jwt_for_seven_day_forecast(jwt_material, monkeypat
         requests_seen.append((url, kwargs))
         return FakeResponse()
 
-    monkeypatch.setattr(weather_module.requests, "get", fake_get)
+    monkeypatch.setattr(weather_module, "_http_get", fake_get)
     monkeypatch.setattr(weather_module, "_record_external_api_timing", lambda *_args: None)
     monkeypatch.setattr(weather_module, "reserve_qweather_request", lambda _endpoint: True)
 
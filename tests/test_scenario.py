@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""scenario 门面的回归测试：各子服务结果合并且宏观 RR 只算一次。"""
+import pytest
+
+from services.scenario import run_scenario
+
+
+FORECAST_TEMPS = [38.0, 36.0, 35.0, 32.0, 28.0, 25.0, 22.0]
+
+
+def test_run_scenario_combines_services(dlnm_service):
+    weather = {'temperature': 38, 'humidity': 90, 'aqi': 100}
+    user = {'age': 75, 'chronic_diseases': ['高血压', '冠心病']}
+
+    result = run_scenario(weather, user_info=user, forecast_temps=FORECAST_TEMPS)
+
+    expected_rr, _ = dlnm_service.calculate_rr(38.0)
+    assert result['macro_rr'] == pytest.approx(expected_rr)
+    assert result['community']['summary']
+    assert result['individual']['overall_risk']['level']
+    assert len(result['forecasts']) == 7
+    assert result['alert_level'] in ('红色预警', '橙色预警', '正常')
+
+
+def test_run_scenario_without_optional_inputs():
+    result = run_scenario({'temperature': 20})
+
+    assert 'individual' not in result
+    assert 'forecasts' not in result
+    assert result['alert_level'] in ('橙色预警', '正常')
+
+
+def test_community_map_reuses_precomputed_rr(community_service):
+    weather = {'temperature': 35}
+
+    baseline = community_service.generate_community_risk_map(weather)
+    reused = community_service.generate_community_risk_map(weather, precomputed_rr=1.0)
+
+    # 传入的 RR 更低，风险摘要不应高于自算结果
+    assert reused['summary']['high_risk_count'] <= baseline['summary']['high_risk_count']
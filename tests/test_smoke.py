@@ -18,13 +18,13 @@ os.environ["DEBUG"] = "true"
 from app import app, db, User  # noqa: E402
 
 
-@pytest.fixture
-def client():
+@pytest.fixture(scope="module", autouse=True)
+def _smoke_db():
+    """整个模块只建一次表，结束时统一 DROP 并删除临时库文件。"""
     app.config["TESTING"] = True
     with app.app_context():
         db.create_all()
-    with app.test_client() as client:
-        yield client
+    yield
     with app.app_context():
         db.session.remove()
         db.drop_all()
@@ -33,6 +33,18 @@ def client():
         os.remove(TEST_DB_PATH)
 
 
+@pytest.fixture
+def client():
+    with app.test_client() as client:
+        yield client
+    # 用例间只清数据不动表结构，省掉每个测试的 DROP/CREATE DDL
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
 def _set_csrf_token(client, token="test-token"):
     with client.session_transaction() as session:
         session["_csrf_token"] = token
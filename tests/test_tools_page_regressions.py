@@ -591,10 +591,8 @@ def test_chronic_risk_get_shows_empty_state_without_synthetic_result(client, db_
     assert '血压波动' not in body
 
 
-def test_chronic_risk_service_uses_submitted_vitals():
-    from services.chronic_risk_service import ChronicRiskService
-
-    service = ChronicRiskService()
+def test_chronic_risk_service_uses_submitted_vitals(chronic_service):
+    service = chronic_service
     weather = {'temperature': 24, 'humidity': 60, 'aqi': 45}
     base = service.predict_individual_risk(
         {'age': 45, 'gender': '男', 'chronic_diseases': [], 'vitals': {'sbp': 120, 'fbg': 5.2}},
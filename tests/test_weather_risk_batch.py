@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""calculate_risk_index_batch 与逐用户版本的一致性回归测试。"""
+import pandas as pd
+
+
+HOT_POLLUTED_WEATHER = {
+    'temperature': 38.0,
+    'temperature_max': 40.0,
+    'temperature_min': 29.0,
+    'temperature_range_source': 'daily',
+    'temperature_range_confidence': 'high',
+    'humidity': 88.0,
+    'wind_speed': 3.0,
+    'aqi': 160,
+}
+
+
+def _profiles():
+    return [
+        {'age': 70, 'has_chronic_disease': True, 'chronic_diseases': ['呼吸道疾病', '关节炎']},
+        {'age': 40, 'has_chronic_disease': False, 'chronic_diseases': []},
+        {'age': 66, 'has_chronic_disease': True, 'chronic_diseases': ['心血管疾病']},
+        {'age': 30, 'has_chronic_disease': False, 'chronic_diseases': ['关节炎']},
+        # 同一关键词命中多个疾病：加成必须按疾病数累加，而非只记一次
+        {'age': 50, 'has_chronic_disease': True, 'chronic_diseases': ['呼吸道疾病', '呼吸衰竭']},
+        {'age': 30, 'has_chronic_disease': True, 'chronic_diseases': ['类风湿关节炎', '骨关节炎']},
+    ]
+
+
+def test_batch_matches_per_user_scores():
+    """批量评分必须与 calculate_risk_index 逐用户结果一致。"""
+    from services.weather_service import WeatherService
+
+    service = WeatherService()
+    profiles = _profiles()
+    expected = [service.calculate_risk_index(HOT_POLLUTED_WEATHER, p) for p in profiles]
+
+    result = service.calculate_risk_index_batch(HOT_POLLUTED_WEATHER, pd.DataFrame(profiles))
+
+    assert list(result['risk_score']) == [e['risk_score'] for e in expected]
+    assert list(result['risk_level']) == [e['risk_level'] for e in expected]
+
+
+def test_batch_handles_missing_columns():
+    """缺失画像列时按无额外风险处理，不抛异常。"""
+    from services.weather_service import WeatherService
+
+    service = WeatherService()
+    df = pd.DataFrame({'age': [70, 20]})
+
+    result = service.calculate_risk_index_batch({'temperature': 20.0}, df)
+
+    assert list(result['risk_score']) == [15, 0]
+    assert list(result['risk_level']) == ['低风险', '低风险']
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""WeatherService TTL 内存缓存回归测试。"""
+
+
+def _make_service():
+    from services.weather_service import WeatherService
+
+    return WeatherService()
+
+
+def test_current_weather_cached_within_ttl(monkeypatch):
+    """TTL 内重复请求同一城市只触发一次上游获取。"""
+    service = _make_service()
+    service.cache_ttl_seconds = 300
+    calls = []
+    real_weather = {'temperature': 30.0, 'is_mock': False, 'data_source': 'QWeather'}
+
+    monkeypatch.setattr(
+        service,
+        '_fetch_current_weather',
+        lambda city: calls.append(city) or real_weather,
+    )
+
+    assert service.get_current_weather('都昌') == real_weather
+    assert service.get_current_weather('都昌') == real_weather
+    assert calls == ['都昌']
+
+
+def test_mock_weather_not_cached(monkeypatch):
+    """mock 兜底结果不入缓存，下次请求必须重新尝试上游。"""
+    service = _make_service()
+    service.cache_ttl_seconds = 300
+    calls = []
+    mock_weather = {'temperature': 20.0, 'is_mock': True, 'data_source': 'Mock'}
+
+    monkeypatch.setattr(
+        service,
+        '_fetch_current_weather',
+        lambda city: calls.append(city) or mock_weather,
+    )
+
+    service.get_current_weather('都昌')
+    service.get_current_weather('都昌')
+    assert calls == ['都昌', '都昌']
+
+
+def test_cache_expires_after_stale_window(monkeypatch):
+    """超过宽限窗后同步重新获取上游数据。"""
+    from services import weather_service as weather_module
+
+    service = _make_service()
+    service.cache_ttl_seconds = 300
+    calls = []
+    real_weather = {'temperature': 30.0, 'is_mock': False, 'data_source': 'QWeather'}
+    fake_now = [1000.0]
+
+    monkeypatch.setattr(weather_module.time, 'monotonic', lambda: fake_now[0])
+    monkeypatch.setattr(
+        service,
+        '_fetch_current_weather',
+        lambda city: calls.append(city) or real_weather,
+    )
+
+    service.get_current_weather('都昌')
+    fake_now[0] += 300 * weather_module._STALE_SERVE_FACTOR + 1
+    service.get_current_weather('都昌')
+    assert calls == ['都昌', '都昌']
+
+
+def test_stale_entry_served_and_refreshed_in_background(monkeypatch):
+    """宽限窗内先返回旧值，同时只提交一次后台刷新。"""
+    import time as real_time
+
+    from services import weather_service as weather_module
+
+    service = _make_service()
+    service.cache_ttl_seconds = 300
+    calls = []
+    old_weather = {'temperature': 30.0, 'is_mock': False, 'data_source': 'QWeather'}
+    fake_now = [1000.0]
+
+    monkeypatch.setattr(weather_module.time, 'monotonic', lambda: fake_now[0])
+    monkeypatch.setattr(
+        service,
+        '_fetch_current_weather',
+        lambda city: calls.append(city) or old_weather,
+    )
+
+    service.get_current_weather('都昌')
+    fake_now[0] += 301  # 过期但仍在宽限窗内
+
+    # 立即拿到旧值，不阻塞在上游请求上
+    assert service.get_current_weather('都昌') == old_weather
+
+    # 后台刷新最终触发第二次上游获取
+    deadline = real_time.monotonic() + 5
+    while len(calls) < 2 and real_time.monotonic() < deadline:
+        real_time.sleep(0.01)
+    assert calls == ['都昌', '都昌']
+
+
+def test_forecast_cache_keyed_by_days(monkeypatch):
+    """不同 days 参数命中不同缓存键，模拟预报不入缓存。"""
+    service = _make_service()
+    service.forecast_cache_ttl_seconds = 1800
+    calls = []
+    real_forecast = [{'date': '2025-01-01', 'is_mock': False, 'data_source': 'QWeather'}]
+
+    monkeypatch.setattr(
+        service,
+        '_fetch_weather_forecast',
+        lambda city, days: calls.append((city, days)) or real_forecast,
+    )
+
+    service.get_weather_forecast('都昌', days=3)
+    service.get_weather_forecast('都昌', days=3)
+    service.get_weather_forecast('都昌', days=7)
+    assert calls == [('都昌', 3), ('都昌', 7)]
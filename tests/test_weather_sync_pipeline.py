@@ -107,7 +107,7 @@ def test_qweather_failures_try_openmeteo_before_mock(monkeypatch, response):
     }
     fallback_calls = []
 
-    monkeypatch.setattr(weather_module.requests, 'get', lambda *_args, **_kwargs: response)
+    monkeypatch.setattr(weather_module, '_http_get', lambda *_args, **_kwargs: response)
     monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
     monkeypatch.setattr(
         service,
@@ -204,7 +204,7 @@ def test_qweather_air_quality_v1_uses_origin_and_lat_lon(monkeypatch):
         calls.append((url, kwargs))
         return weather_response if len(calls) == 1 else air_response
 
-    monkeypatch.setattr(weather_module.requests, 'get', fake_get)
+    monkeypatch.setattr(weather_module, '_http_get', fake_get)
     monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
     monkeypatch.setattr(
         weather_module,
@@ -245,7 +245,7 @@ def test_qweather_air_quality_failure_keeps_weather_available(monkeypatch):
         _Response(403, {}),
     ])
 
-    monkeypatch.setattr(weather_module.requests, 'get', lambda *_args, **_kwargs: next(responses))
+    monkeypatch.setattr(weather_module, '_http_get', lambda *_args, **_kwargs: next(responses))
     monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
     monkeypatch.setattr(weather_module, 'reserve_qweather_request', lambda _endpoint: True)
     monkeypatch.setattr(
@@ -281,7 +281,7 @@ def test_qweather_air_quality_does_not_use_generic_qaqi(monkeypatch):
         ],
     })
 
-    monkeypatch.setattr(weather_module.requests, 'get', lambda *_args, **_kwargs: response)
+    monkeypatch.setattr(weather_module, '_http_get', lambda *_args, **_kwargs: response)
     monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
     monkeypatch.setattr(weather_module, 'reserve_qweather_request', lambda _endpoint: True)
 
@@ -330,7 +330,7 @@ def test_qweather_air_quality_invalid_payload_stays_unknown(monkeypatch, respons
     service.qweather_key = 'test-key'
     service.api_base_url = 'https://api.qweather.invalid/v7'
 
-    monkeypatch.setattr(weather_module.requests, 'get', lambda *_args, **_kwargs: response)
+    monkeypatch.setattr(weather_module, '_http_get', lambda *_args, **_kwargs: response)
     monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
     monkeypatch.setattr(weather_module, 'reserve_qweather_request', lambda _endpoint: True)
 
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""和风上游失败冷却（breaker）回归测试。"""
+import pytest
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = 'upstream response'
+
+    def json(self):
+        return self._payload
+
+
+def _failing_service(monkeypatch, weather_module):
+    service = weather_module.WeatherService()
+    service.qweather_key = 'test-key'
+    service.api_base_url = 'https://qweather.invalid'
+    service.cache_ttl_seconds = 0  # 只验证 breaker，关闭结果缓存
+    fallback = {'is_mock': False, 'data_source': 'Open-Meteo'}
+
+    monkeypatch.setattr(weather_module, '_record_external_api_timing', lambda *_args: None)
+    monkeypatch.setattr(service, '_get_openmeteo_weather', lambda _city: fallback)
+    return service, fallback
+
+
+def test_failed_upstream_skipped_during_cooldown(monkeypatch):
+    """首次失败后，冷却期内不得再向和风发请求。"""
+    from services import weather_service as weather_module
+
+    service, fallback = _failing_service(monkeypatch, weather_module)
+    calls = []
+
+    def fake_get(*_args, **_kwargs):
+        calls.append(1)
+        return _Response(503, {'code': '503'})
+
+    monkeypatch.setattr(weather_module, '_http_get', fake_get)
+
+    assert service.get_current_weather('都昌') == fallback
+    assert service.get_current_weather('都昌') == fallback
+    assert len(calls) == 1
+
+
+def test_breaker_reopens_after_cooldown(monkeypatch):
+    """冷却期结束后恢复对和风的尝试。"""
+    from services import weather_service as weather_module
+
+    service, fallback = _failing_service(monkeypatch, weather_module)
+    calls = []
+    fake_now = [1000.0]
+
+    monkeypatch.setattr(weather_module.time, 'monotonic', lambda: fake_now[0])
+    monkeypatch.setattr(
+        weather_module,
+        '_http_get',
+        lambda *_a, **_k: calls.append(1) or _Response(503, {'code': '503'}),
+    )
+
+    service.get_current_weather('都昌')
+    fake_now[0] += weather_module._BREAKER_COOLDOWN_SECONDS + 1
+    service.get_current_weather('都昌')
+    assert len(calls) == 2
+
+
+def test_success_resets_breaker_state(monkeypatch):
+    """成功响应后清除冷却标记。"""
+    from services import weather_service as weather_module
+
+    service, _fallback = _failing_service(monkeypatch, weather_module)
+    service._trip_breaker('weather_now')
+    service._reset_breaker('weather_now')
+    assert not service._breaker_open('weather_now')
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 序列化统一入口
+
+优先使用 orjson（C 实现，快3-10倍），缺失时自动回退标准库。
+供审计日志、解析工具等热路径复用，避免各处重复写回退逻辑。
+"""
+
+try:
+    import orjson
+
+    def dumps(value):
+        """序列化为 str；OPT_NON_STR_KEYS 保持与标准库一致的数字键行为。"""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - 环境缺失时回退标准库
+    import json as _stdlib_json
+
+    def dumps(value):
+        return _stdlib_json.dumps(value, ensure_ascii=False)
+
+    loads = _stdlib_json.loads
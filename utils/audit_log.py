@@ -2,20 +2,151 @@
 """Security audit logging helpers."""
 from __future__ import annotations
 
-import json
+import atexit
 import logging
+import queue
+import threading
+import weakref
 from typing import Any, Dict, Optional
 
 from flask import current_app, g, has_app_context, request
 
+from utils._json import dumps as _json_dumps
+
 logger = logging.getLogger(__name__)
 
+# 审计入库改为异步批量：请求线程只入队，后台线程攒批写库，
+# 业务事务不再被审计 INSERT 拖慢
+_QUEUE_MAXSIZE = 10000
+_BATCH_MAX = 500
+_BATCH_WAIT_SECONDS = 0.5
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+_worker_lock = threading.Lock()
+_worker_app = None
+_dropped_events = 0
+
+# 按 app 缓存功能开关与模型类，高 QPS 路径不再反复解 LocalProxy/查 config
+_audit_enabled_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_AuditLog = None
+
+
+def _audit_enabled(app) -> bool:
+    """FEATURE_AUDIT_LOGS 每个 app 只读一次；配置热更新后调 reset_audit_flag_cache。"""
+    enabled = _audit_enabled_cache.get(app)
+    if enabled is None:
+        enabled = bool(app.config.get("FEATURE_AUDIT_LOGS"))
+        _audit_enabled_cache[app] = enabled
+    return enabled
+
+
+def reset_audit_flag_cache():
+    """清空开关缓存（运行期修改 FEATURE_AUDIT_LOGS 后调用）。"""
+    _audit_enabled_cache.clear()
+
+
+def _drain_batch(block=True):
+    """从队列取出一批事件（最多 _BATCH_MAX 条）。"""
+    items = []
+    try:
+        if block:
+            items.append(_queue.get(timeout=_BATCH_WAIT_SECONDS))
+        else:
+            items.append(_queue.get_nowait())
+    except queue.Empty:
+        return items
+    while len(items) < _BATCH_MAX:
+        try:
+            items.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+
+def _persist_batch(app, batch):
+    """在独立 app 上下文里批量落库；失败只告警，不影响业务请求。"""
+    if not batch:
+        return
+    global _AuditLog
+    if _AuditLog is None:
+        from core.db_models import AuditLog
+        _AuditLog = AuditLog
+    from core.extensions import db
+
+    with app.app_context():
+        try:
+            db.session.bulk_save_objects([_AuditLog(**data) for data in batch])
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.warning("Failed to persist audit log batch: %s", exc)
+        finally:
+            db.session.remove()
+
+
+def _worker_loop(app):
+    while True:
+        batch = _drain_batch()
+        if not batch:
+            continue
+        try:
+            _persist_batch(app, batch)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _ensure_worker(app):
+    """惰性启动后台写入线程（进程内只启动一次）。"""
+    global _worker_app
+    if _worker_app is not None:
+        return
+    with _worker_lock:
+        if _worker_app is not None:
+            return
+        _worker_app = app
+        thread = threading.Thread(
+            target=_worker_loop, args=(app,), name='audit-log-writer', daemon=True
+        )
+        thread.start()
+        atexit.register(flush_audit_queue)
+
+
+def flush_audit_queue():
+    """阻塞直到队列中的审计事件全部落库（进程退出与测试断言前使用）。"""
+    if _worker_app is None:
+        return
+    _queue.join()
+
 
 def _serialize_extra(extra_data: Optional[Dict[str, Any]]) -> str:
     if not extra_data:
         return "{}"
+    # 快速通道：审计附加信息通常是几个键的扁平原始类型字典，
+    # 无需转义时直接拼 JSON 串，跳过通用序列化器
+    if len(extra_data) <= 8:
+        parts = []
+        for key, value in extra_data.items():
+            if not isinstance(key, str) or '"' in key or '\\' in key or not key.isprintable():
+                break
+            if value is None:
+                parts.append(f'"{key}":null')
+            elif value is True:
+                parts.append(f'"{key}":true')
+            elif value is False:
+                parts.append(f'"{key}":false')
+            elif isinstance(value, (int, float)):
+                parts.append(f'"{key}":{value!r}')
+            elif isinstance(value, str):
+                if '"' in value or '\\' in value or not value.isprintable():
+                    break
+                parts.append(f'"{key}":"{value}"')
+            else:
+                break
+        else:
+            return '{' + ','.join(parts) + '}'
     try:
-        return json.dumps(extra_data, ensure_ascii=True)
+        return _json_dumps(extra_data)
     except (TypeError, ValueError):
         return "{}"
 
@@ -38,15 +169,15 @@ def log_security_event(
         "resource_id": resource_id,
         "request_id": getattr(g, "request_id", None),
     }
-    logger.info("SECURITY_EVENT %s", json.dumps(payload, ensure_ascii=True))
+    logger.info("SECURITY_EVENT %s", _json_dumps(payload))
 
-    if not has_app_context() or not current_app.config.get("FEATURE_AUDIT_LOGS"):
+    if not has_app_context():
+        return
+    app = current_app._get_current_object()
+    if not _audit_enabled(app):
         return
 
     try:
-        from core.db_models import AuditLog
-        from core.extensions import db
-
         from core.audit import _get_client_ip_context
 
         ip_ctx = _get_client_ip_context()
@@ -56,7 +187,8 @@ def log_security_event(
         if ip_ctx.get("ip_prefix"):
             extra_payload.setdefault("ip_prefix", ip_ctx.get("ip_prefix"))
 
-        entry = AuditLog(
+        # 请求线程只负责把已解析好的字段入队，真正的 INSERT 由后台线程攒批执行
+        entry_data = dict(
             actor_id=actor_id,
             actor_role=actor_role,
             action=action,
@@ -68,13 +200,12 @@ def log_security_event(
             user_agent=request.headers.get("User-Agent"),
             request_id=getattr(g, "request_id", None),
         )
-        # 使用 savepoint 隔离，避免干扰调用方的主事务
-        nested = db.session.begin_nested()
+        _ensure_worker(app)
         try:
-            db.session.add(entry)
-            nested.commit()
-        except Exception:
-            nested.rollback()
-            raise
+            _queue.put_nowait(entry_data)
+        except queue.Full:
+            global _dropped_events
+            _dropped_events += 1
+            logger.warning("Audit log queue full, dropped %s events so far", _dropped_events)
     except Exception as exc:
-        logger.warning("Failed to persist audit log: %s", exc)
+        logger.warning("Failed to enqueue audit log: %s", exc)
@@ -2,7 +2,6 @@
 """Database transaction helpers."""
 from __future__ import annotations
 
-from contextlib import contextmanager
 import logging
 
 from core.extensions import db
@@ -10,7 +9,31 @@ from core.extensions import db
 logger = logging.getLogger(__name__)
 
 
-@contextmanager
+class _AtomicTransaction:
+    """轻量事务上下文：免去 @contextmanager 的生成器对象与两次 send。"""
+
+    __slots__ = ('session',)
+
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.session.rollback()
+            logger.error("Transaction rolled back", exc_info=(exc_type, exc, tb))
+            return False
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            logger.exception("Transaction rolled back")
+            raise
+        return False
+
+
 def atomic_transaction(session=None):
     """Commit or roll back a transaction atomically.
 
@@ -18,11 +41,4 @@ def atomic_transaction(session=None):
         with atomic_transaction():
             db.session.add(model)
     """
-    active_session = session or db.session
-    try:
-        yield active_session
-        active_session.commit()
-    except Exception:
-        active_session.rollback()
-        logger.exception("Transaction rolled back")
-        raise
+    return _AtomicTransaction(session or db.session)
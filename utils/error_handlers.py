@@ -6,33 +6,38 @@ import json
 import logging
 from typing import Optional, Tuple
 
-from flask import current_app, jsonify
+from flask import Response, current_app, jsonify
+
+from utils._json import dumps as _json_dumps
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_ERROR_MESSAGE = "服务暂时不可用，请稍后再试"
 
+# 异常类型 -> (状态码, 安全文案)。精确命中是一次哈希查找；
+# 子类沿 __mro__ 找最近的登记祖先，等价于原先自特殊到一般的 isinstance 阶梯
+_EXCEPTION_STATUS_MAP = {
+    FileNotFoundError: (404, "资源不存在"),
+    json.JSONDecodeError: (400, "JSON 解析失败"),
+    KeyError: (400, "缺少必要字段"),
+    ValueError: (400, "参数错误"),
+    TypeError: (400, "参数类型错误"),
+    PermissionError: (403, "权限不足"),
+    TimeoutError: (504, "请求超时"),
+    OSError: (500, "系统资源异常"),
+    RuntimeError: (500, "服务运行异常"),
+}
+
 
 def classify_exception(exc: Exception) -> Tuple[int, str]:
     """Classify exceptions into HTTP status codes and safe messages."""
-    if isinstance(exc, FileNotFoundError):
-        return 404, "资源不存在"
-    if isinstance(exc, json.JSONDecodeError):
-        return 400, "JSON 解析失败"
-    if isinstance(exc, KeyError):
-        return 400, "缺少必要字段"
-    if isinstance(exc, ValueError):
-        return 400, "参数错误"
-    if isinstance(exc, TypeError):
-        return 400, "参数类型错误"
-    if isinstance(exc, PermissionError):
-        return 403, "权限不足"
-    if isinstance(exc, TimeoutError):
-        return 504, "请求超时"
-    if isinstance(exc, OSError):
-        return 500, "系统资源异常"
-    if isinstance(exc, RuntimeError):
-        return 500, "服务运行异常"
+    hit = _EXCEPTION_STATUS_MAP.get(type(exc))
+    if hit is not None:
+        return hit
+    for cls in type(exc).__mro__:
+        hit = _EXCEPTION_STATUS_MAP.get(cls)
+        if hit is not None:
+            return hit
     return 500, DEFAULT_ERROR_MESSAGE
 
 
@@ -46,14 +51,20 @@ def handle_api_exception(
 ):
     """Handle API exceptions with consistent logging and responses."""
     active_logger = log or logger
-    active_logger.exception(context_msg)
-
-    if include_details is None:
-        include_details = current_app.config.get("DEBUG", False)
 
     default_status, message = classify_exception(exc)
     status = status_code or default_status
 
+    # 预期内的 4xx（参数/JSON 校验失败）不值一份完整堆栈；
+    # 只有 5xx 才走 exception 记录 traceback
+    if status < 500:
+        active_logger.warning("%s: %r", context_msg, exc)
+    else:
+        active_logger.exception(context_msg)
+
+    if include_details is None:
+        include_details = current_app.config.get("DEBUG", False)
+
     payload = {
         "success": False,
         "error": message,
@@ -62,6 +73,11 @@ def handle_api_exception(
         payload["error_detail"] = str(exc)
         payload["error_type"] = type(exc).__name__
 
+    # 热错误路径（限流风暴、批量校验失败）直接构造 Response，
+    # 跳过 Flask json provider 调度；调试排查时可关掉开关走 jsonify
+    if current_app.config.get("FAST_ERROR_RESPONSE", True):
+        return Response(_json_dumps(payload), status=status, mimetype="application/json")
+
     response = jsonify(payload)
     response.status_code = status
     return response
@@ -23,7 +23,19 @@ _DEFAULT_MESSAGES: Dict[str, Dict[str, str]] = {
 }
 
 
+# 摊平成 "lang:key" 单层字典：错误响应路径上一次哈希查找取代两级 get
+_MESSAGES_FLAT: Dict[str, str] = {
+    f"{lang}:{key}": message
+    for lang, messages in _DEFAULT_MESSAGES.items()
+    for key, message in messages.items()
+}
+_FALLBACK_MESSAGE = _MESSAGES_FLAT["zh:unknown_error"]
+
+
 def get_error_message(key: str, lang: str = "zh") -> str:
     """Return an error message for a given key and language."""
-    messages = _DEFAULT_MESSAGES.get(lang, _DEFAULT_MESSAGES["zh"])
-    return messages.get(key, messages.get("unknown_error", "Unknown error"))
+    return (
+        _MESSAGES_FLAT.get(f"{lang}:{key}")
+        or _MESSAGES_FLAT.get(f"zh:{key}")
+        or _FALLBACK_MESSAGE
+    )
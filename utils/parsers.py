@@ -5,8 +5,27 @@
 统一的解析函数，消除重复代码。
 所有函数保持原有行为不变。
 """
-import json
-from datetime import datetime
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+
+from utils._json import dumps as _json_dumps, loads as _json_loads
+
+# 模块级常量：parse_bool 每次请求解析查询串都会调用，免去重建元组的开销
+_TRUE_STRS = frozenset(('1', 'true', 'yes', 'on'))
+_FALSE_STRS = frozenset(('0', 'false', 'no', 'off'))
+
+# 年龄段分界点（右开区间），编码即 bisect 命中的桶序号
+_AGE_BUCKETS = (18, 40, 60, 80)
+
+# 年龄段名称表，与 get_age_group 的编码一一对应
+_AGE_GROUP_NAMES = (
+    '0-17岁(未成年)',
+    '18-39岁(青年)',
+    '40-59岁(中年)',
+    '60-79岁(老年)',
+    '80岁以上(高龄)'
+)
 
 
 def parse_int(value, default=None):
@@ -39,9 +58,9 @@ def parse_bool(value, default=False):
         return value != 0
     if isinstance(value, str):
         normalized = value.strip().lower()
-        if normalized in ('1', 'true', 'yes', 'on'):
+        if normalized in _TRUE_STRS:
             return True
-        if normalized in ('0', 'false', 'no', 'off'):
+        if normalized in _FALSE_STRS:
             return False
         return default
     return default
@@ -52,7 +71,9 @@ def parse_date(value):
     if not value:
         return None
     try:
-        return datetime.strptime(value, '%Y-%m-%d').date()
+        # fromisoformat 是 C 实现，比 strptime 的格式状态机快数倍；
+        # 只取前10位，兼容带时间后缀的输入
+        return date.fromisoformat(value[:10])
     except (TypeError, ValueError):
         return None
 
@@ -74,19 +95,20 @@ def parse_age(age_str):
     age_str = str(age_str).strip()
     if not age_str:
         return None
-    
-    if '岁' in age_str:
+
+    # 单次扫描：只看末尾单位字符，省掉逐字符 in 查找与 replace 的中间串
+    last = age_str[-1]
+    if last == '岁':
         try:
-            return float(age_str.replace('岁', '').strip())
+            return float(age_str[:-1].strip())
         except (ValueError, TypeError):
             return None
-    elif '月' in age_str or '天' in age_str:
+    if last in ('月', '天'):
         return 0  # 婴儿算0岁
-    else:
-        try:
-            return float(age_str)
-        except (ValueError, TypeError):
-            return None
+    try:
+        return float(age_str)
+    except (ValueError, TypeError):
+        return None
 
 
 def get_age_group(age):
@@ -103,20 +125,19 @@ def get_age_group(age):
     if age is None:
         return 2  # 默认中年
     try:
-        age = float(age)
+        return bisect_right(_AGE_BUCKETS, float(age))
     except (TypeError, ValueError):
         return 2
-    
-    if age < 18:
-        return 0
-    elif age < 40:
-        return 1
-    elif age < 60:
-        return 2
-    elif age < 80:
-        return 3
-    else:
-        return 4
+
+
+def get_age_group_bulk(ages):
+    """批量版 get_age_group：按 searchsorted 一次算完整列年龄编码。
+
+    用于 ML/队列分析等按行打分的批处理路径；输入可为列表或 ndarray。
+    """
+    import numpy as np
+
+    return np.searchsorted(_AGE_BUCKETS, np.asarray(ages, dtype=float), side='right')
 
 
 def get_age_group_name(age):
@@ -130,15 +151,8 @@ def get_age_group_name(age):
     - "60-79岁(老年)"
     - "80岁以上(高龄)"
     """
-    names = [
-        '0-17岁(未成年)',
-        '18-39岁(青年)',
-        '40-59岁(中年)',
-        '60-79岁(老年)',
-        '80岁以上(高龄)'
-    ]
     group = get_age_group(age)
-    return names[group] if 0 <= group < len(names) else '未知'
+    return _AGE_GROUP_NAMES[group] if 0 <= group < len(_AGE_GROUP_NAMES) else '未知'
 
 
 def safe_json_loads(value, default=None):
@@ -148,8 +162,8 @@ def safe_json_loads(value, default=None):
     if not value:
         return default
     try:
-        return json.loads(value)
-    except (TypeError, ValueError, json.JSONDecodeError):
+        return _json_loads(value)
+    except (TypeError, ValueError):
         return default
 
 
@@ -160,8 +174,22 @@ def compact_dict(data):
     return {k: v for k, v in data.items() if v not in (None, '', [], {})}
 
 
+@lru_cache(maxsize=1024)
+def _json_or_none_cached(items_tuple):
+    return _json_dumps({k: v for k, _value_type, v in items_tuple})
+
+
 def json_or_none(value):
     """空JSON返回None，否则序列化"""
     if value in (None, '', [], {}):
         return None
-    return json.dumps(value, ensure_ascii=False)
+    # 小字典（健康档案片段、天气查询参数）经常重复出现，
+    # 键值可哈希时直接复用上次序列化结果；保持原有键序不排序。
+    # 缓存键必须带上值类型：1、True、1.0 相等且同哈希，
+    # 只按键值对缓存会把 {'flag': True} 命中 {'flag': 1} 的结果，串掉存储类型
+    if isinstance(value, dict) and len(value) <= 10:
+        try:
+            return _json_or_none_cached(tuple((k, type(v), v) for k, v in value.items()))
+        except TypeError:
+            pass
+    return _json_dumps(value)
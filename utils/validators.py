@@ -7,8 +7,29 @@
 import logging
 import re
 
+try:
+    import nh3  # 可选依赖：Rust 实现的 HTML 清理，比 bleach/html5lib 快一个量级
+except ImportError:  # pragma: no cover - 环境缺失时回退 bleach
+    nh3 = None
+
 logger = logging.getLogger(__name__)
 
+# 模块级预编译热路径正则，免去每次调用的模式缓存查找
+_USERNAME_RE = re.compile(r'^[\w\u4e00-\u9fa5]+$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_SCRIPT_STYLE_RE = re.compile(r'(?is)<\s*(script|style)[^>]*>.*?<\s*/\s*\1\s*>')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# 性别归一化表：批量导入时逐行调用，放模块级避免每次重建字典
+_GENDER_MAP = {
+    '男': '男性',
+    '男性': '男性',
+    '女': '女性',
+    '女性': '女性',
+    '其他': '其他',
+    '未知': '未知'
+}
+
 
 def validate_username(username):
     """验证用户名：3-25字符，只能包含字母、数字、下划线和中文"""
@@ -17,11 +38,41 @@ def validate_username(username):
     username = username.strip()
     if len(username) < 3 or len(username) > 25:
         return False, '用户名长度需在3-25字符之间'
-    if not re.match(r'^[\w\u4e00-\u9fa5]+$', username):
+    if not _USERNAME_RE.match(username):
         return False, '用户名只能包含字母、数字、下划线和中文'
     return True, username
 
 
+def validate_usernames(usernames):
+    """批量校验用户名，返回与输入等长的布尔列表。
+
+    批量导入（CSV）场景下绑定一次 .match 后列表推导，
+    摊薄逐行调用 validate_username 的函数调用开销。
+    """
+    match = _USERNAME_RE.match
+    results = []
+    for name in usernames:
+        if not name or not isinstance(name, str):
+            results.append(False)
+            continue
+        name = name.strip()
+        results.append(3 <= len(name) <= 25 and match(name) is not None)
+    return results
+
+
+def validate_emails(emails):
+    """批量校验邮箱，返回与输入等长的布尔列表（空值视为有效，同单条校验）。"""
+    match = _EMAIL_RE.match
+    results = []
+    for email in emails:
+        if not email:
+            results.append(True)  # 邮箱可选
+            continue
+        email = email.strip()
+        results.append(len(email) <= 120 and match(email) is not None)
+    return results
+
+
 def validate_password(password):
     """验证密码：至少6位"""
     if not password or not isinstance(password, str):
@@ -40,8 +91,7 @@ def validate_email(email):
     email = email.strip()
     if len(email) > 120:
         return False, '邮箱长度不能超过120字符'
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if not _EMAIL_RE.match(email):
         return False, '邮箱格式不正确'
     return True, email
 
@@ -64,17 +114,9 @@ def validate_gender(gender):
     if not gender:
         return True, None
     gender = gender.strip()
-    gender_map = {
-        '男': '男性',
-        '男性': '男性',
-        '女': '女性',
-        '女性': '女性',
-        '其他': '其他',
-        '未知': '未知'
-    }
-    if gender not in gender_map:
+    if gender not in _GENDER_MAP:
         return False, '性别选择不正确'
-    return True, gender_map[gender]
+    return True, _GENDER_MAP[gender]
 
 
 def sanitize_input(text, max_length=200):
@@ -92,19 +134,31 @@ def sanitize_input(text, max_length=200):
     if not isinstance(text, str):
         return str(text)[:max_length]
 
+    # 快速通道：绝大多数表单输入（用户名、城市名、数字串）不含任何 HTML
+    # 元字符，直接跳过清理器；出现可疑片段时才走完整清理
+    if len(text) <= max_length and '<' not in text and '&' not in text:
+        stripped = text.strip()
+        lowered = stripped.lower()
+        if stripped and 'javascript:' not in lowered and 'data:' not in lowered:
+            return stripped[:max_length]
+
     # 先移除 <script>/<style> 及其内容。bleach.strip=True 会移除标签但保留内容；
     # 对于脚本/样式内容，保留文本没有意义且容易在其它上下文被误用。
     try:
-        text = re.sub(
-            r'(?is)<\s*(script|style)[^>]*>.*?<\s*/\s*\1\s*>',
-            '',
-            text,
-        )
+        text = _SCRIPT_STYLE_RE.sub('', text)
     except Exception:
         # 正则失败时继续走 bleach 兜底即可
         pass
 
-    # 使用 bleach 进行严格清理（不允许任何标签）
+    # 严格清理：不允许任何标签/属性/协议。优先走 nh3（Rust），缺失时回退 bleach
+    if nh3 is not None:
+        cleaned = nh3.clean(
+            text,
+            tags=set(),        # 不允许任何 HTML 标签
+            attributes={},     # 不允许任何属性
+            strip_comments=True
+        )
+        return _finalize_cleaned(cleaned, max_length)
     try:
         import bleach
         # 不允许任何标签，不允许任何属性，不允许任何协议
@@ -121,6 +175,14 @@ def sanitize_input(text, max_length=200):
         import html
         cleaned = html.escape(text)
         # 额外移除可能的标签残留
-        cleaned = re.sub(r'<[^>]+>', '', cleaned)
+        cleaned = _TAG_RE.sub('', cleaned)
+
+    return _finalize_cleaned(cleaned, max_length)
+
 
-    return cleaned.strip()[:max_length]
+def _finalize_cleaned(cleaned, max_length):
+    """收尾：未超长时不再切片分配；超长时先截断再去掉可能切出的尾部空白。"""
+    cleaned = cleaned.strip()
+    if len(cleaned) > max_length:
+        cleaned = cleaned[:max_length].rstrip()
+    return cleaned